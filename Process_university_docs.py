@@ -1,6 +1,7 @@
 import os
 import json
 from unstructured.partition.pdf import partition_pdf
+from utils.table_format import compact_table_chunk
 
 
 os.environ['UNSTRUCTURED_CACHE_DIR'] = 'model_cache'
@@ -24,6 +25,8 @@ def process_all_pdfs(input_dir):
     """
     Processes all PDFs in a directory, handling text and tables,
     and returns a clean list of chunks for RAG ingestion.
+    Tables are stored in compact form (markdown content, a short embedding text,
+    row records) with the original HTML kept alongside.
     """
     if not os.path.isdir(input_dir):
         print(f"❌ ERROR: Input directory '{input_dir}' not found.")
@@ -75,6 +78,8 @@ def process_all_pdfs(input_dir):
                         "element_type": element_type
                     }               
                 }
+                if element_type == "Table":
+                    chunk = compact_table_chunk(chunk)
                 all_final_chunks.append(chunk)
 
             print(f"✅ Successfully processed and chunked '{filename}'.")
@@ -0,0 +1,180 @@
+import os
+import csv
+import json
+import time
+import random
+import argparse
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+from scrapper import EnhancedErpScraper, create_firefox_driver, URLS
+from utils.driver_pool import DriverPool
+from utils.scrape_cache import ScrapeCache
+from utils.session_store import SessionStore
+
+DATA_FOLDER = "data"
+PROGRESS_FILE = os.path.join(DATA_FOLDER, "batch_progress.jsonl")
+DEFAULT_WORKERS = 2
+# Minimum seconds between two scrapes starting against the same ERP host. Only the starts
+# are spaced out: the page loads within one scrape are not throttled.
+DEFAULT_HOST_INTERVAL = 5.0
+DEFAULT_RETRIES = 3
+BACKOFF_BASE_SECONDS = 10.0
+
+
+class HostRateLimiter:
+    """
+    Spaces out the start of scrapes against each host by at least `min_interval` seconds.
+    It does not bound the request rate: each scrape's own page loads run unthrottled, so
+    the load on the host also grows with the number of workers.
+    """
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def load_credentials(file_path):
+    """Reads roll_no/password pairs from a CSV (with a header row) or a JSONL file."""
+    credentials = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        if file_path.lower().endswith(".jsonl"):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for row in rows:
+            roll_no = (row.get("roll_no") or "").strip()
+            password = row.get("password") or ""
+            if roll_no and password:
+                credentials.append((roll_no, password))
+    return credentials
+
+
+def load_finished(progress_file):
+    """Roll numbers already scraped successfully by an earlier (possibly interrupted) run."""
+    finished = set()
+    try:
+        with open(progress_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # A line cut short by an interruption
+                if entry.get("status") == "done":
+                    finished.add(entry["roll_no"])
+    except FileNotFoundError:
+        pass
+    return finished
+
+
+def scrape_student(driver_pool, cache, session_store, rate_limiter, roll_no, password, retries):
+    """Scrapes one student with retries and exponential backoff. Returns a progress entry."""
+    start = time.perf_counter()
+    error = None
+    for attempt in range(1, retries + 1):
+        rate_limiter.wait(URLS["login"])
+        try:
+            with driver_pool.lease() as driver:
+                with EnhancedErpScraper(roll_no, password, driver=driver, session_store=session_store) as scraper:
+                    data = scraper.scrape_all_data(snapshot=cache.snapshot(roll_no))
+                    fingerprints = scraper.fingerprints
+                    failed_sections = scraper.failed_sections
+            if "error" not in data:
+                cache.save(roll_no, data, password=password, fingerprints=fingerprints,
+                           failed_sections=failed_sections)
+                return {"roll_no": roll_no, "status": "done", "attempts": attempt,
+                        "seconds": round(time.perf_counter() - start, 2)}
+            error = data["error"]
+            if error.startswith("Login Failed"):
+                break  # Wrong credentials will not succeed on a retry
+        except Exception as e:
+            error = str(e)
+
+        if attempt < retries:
+            delay = BACKOFF_BASE_SECONDS * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+            print(f"    - ⚠️ {roll_no}: attempt {attempt} failed ({error}). Retrying in {delay:.0f}s...")
+            time.sleep(delay)
+
+    return {"roll_no": roll_no, "status": "failed", "attempts": attempt,
+            "seconds": round(time.perf_counter() - start, 2), "error": error}
+
+
+def run_batch(credentials, workers, host_interval, retries, progress_file):
+    finished = load_finished(progress_file)
+    pending = [(r, p) for r, p in credentials if r not in finished]
+    print(f"Found {len(credentials)} student(s); {len(finished & {r for r, _ in credentials})} already done, "
+          f"{len(pending)} to scrape with {workers} worker(s).")
+    if not pending:
+        return
+
+    cache = ScrapeCache(DATA_FOLDER)
+    session_store = SessionStore()
+    driver_pool = DriverPool(create_firefox_driver, size=workers, max_uses=20, reset_url=URLS["login"])
+    rate_limiter = HostRateLimiter(host_interval)
+    write_lock = threading.Lock()
+    results = []
+    start = time.perf_counter()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor, open(progress_file, 'a', encoding='utf-8') as log:
+            futures = [
+                executor.submit(scrape_student, driver_pool, cache, session_store, rate_limiter, roll_no, password, retries)
+                for roll_no, password in pending
+            ]
+            for future in as_completed(futures):
+                entry = future.result()
+                results.append(entry)
+                # Record each result as soon as it finishes so an interrupted run can resume
+                with write_lock:
+                    log.write(json.dumps(entry) + "\n")
+                    log.flush()
+                icon = "✅" if entry["status"] == "done" else "❌"
+                print(f"{icon} [{len(results)}/{len(pending)}] {entry['roll_no']} "
+                      f"({entry['seconds']}s, {entry['attempts']} attempt(s))")
+    finally:
+        driver_pool.shutdown()
+
+    elapsed_minutes = (time.perf_counter() - start) / 60
+    failures = sum(1 for r in results if r["status"] != "done")
+    print("\n========================================================")
+    print(f"🎉 Batch complete: {len(results) - failures} succeeded, {failures} failed.")
+    print(f"   Throughput:   {len(results) / elapsed_minutes if elapsed_minutes else 0:.2f} students/minute")
+    print(f"   Failure rate: {failures / len(results) if results else 0:.1%}")
+    print(f"   Driver pool:  {driver_pool.metrics()}")
+    print("========================================================")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    arg_parser = argparse.ArgumentParser(description="Pre-scrape ERP data for many students.")
+    arg_parser.add_argument("credentials_file", help="CSV with roll_no,password columns, or JSONL with the same keys")
+    arg_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Browsers scraping at the same time")
+    arg_parser.add_argument("--host-interval", type=float, default=DEFAULT_HOST_INTERVAL,
+                            help="Minimum seconds between scrapes starting against the ERP host "
+                                 "(the page loads within a scrape are not throttled)")
+    arg_parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Attempts per student")
+    arg_parser.add_argument("--progress-file", default=PROGRESS_FILE, help="Where finished students are recorded")
+    arg_parser.add_argument("--restart", action="store_true", help="Ignore the progress file and scrape everyone again")
+    args = arg_parser.parse_args()
+
+    os.makedirs(DATA_FOLDER, exist_ok=True)
+    if args.restart and os.path.exists(args.progress_file):
+        os.remove(args.progress_file)
+
+    credentials = load_credentials(args.credentials_file)
+    if not credentials:
+        print(f"❌ Error: No roll_no/password pairs found in '{args.credentials_file}'.")
+        exit()
+
+    run_batch(credentials, max(1, args.workers), args.host_interval, max(1, args.retries), args.progress_file)
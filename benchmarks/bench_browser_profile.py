@@ -0,0 +1,110 @@
+"""
+Compares the default Firefox configuration with the lean scraping profile.
+For each profile a fresh browser loads every ERP page (the login page only, unless
+ERP_ROLL_NO / ERP_PASSWORD are set in .env) and the page-load times and the resident
+memory of the whole browser process tree are printed. RSS needs `psutil`.
+
+    python -m benchmarks.bench_browser_profile --rounds 3
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapper import EnhancedErpScraper, create_firefox_driver, URLS
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+PROFILES = {
+    "default": {"lean": False, "block_third_party": False},
+    "lean": {"lean": True, "block_third_party": False},
+    "lean+blocking": {"lean": True, "block_third_party": True},
+}
+
+# Milliseconds from the start of navigation until the load event finished
+LOAD_TIME_SCRIPT = """
+const [nav] = performance.getEntriesByType('navigation');
+return nav ? nav.loadEventEnd : null;
+"""
+
+
+def browser_rss_mb(driver):
+    """Resident memory of the Firefox process and all its content processes, in MB."""
+    if psutil is None:
+        return None
+    pid = driver.capabilities.get("moz:processID")
+    if not pid:
+        return None
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return None
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.NoSuchProcess:
+            continue
+    return total / (1024 * 1024)
+
+
+def measure_profile(settings, roll_no, password):
+    """Loads every page once in a fresh browser. Returns ({page: (wall s, load ms)}, rss MB)."""
+    driver = create_firefox_driver(**settings)
+    try:
+        pages = {"login": URLS["login"]}
+        if roll_no and password:
+            EnhancedErpScraper(roll_no, password, driver=driver)._login()
+            pages = {name: url for name, url in URLS.items() if name != "login"}
+
+        timings = {}
+        for name, url in pages.items():
+            start = time.perf_counter()
+            driver.get(url)
+            wall = time.perf_counter() - start
+            timings[name] = (wall, driver.execute_script(LOAD_TIME_SCRIPT))
+        return timings, browser_rss_mb(driver)
+    finally:
+        driver.quit()
+
+
+def run_benchmark(rounds, roll_no, password):
+    results = {name: {"pages": {}, "rss": []} for name in PROFILES}
+    for round_no in range(1, rounds + 1):
+        for name, settings in PROFILES.items():
+            print(f"\n===== Round {round_no}/{rounds}: {name} profile =====")
+            timings, rss = measure_profile(settings, roll_no, password)
+            for page, timing in timings.items():
+                results[name]["pages"].setdefault(page, []).append(timing)
+            if rss is not None:
+                results[name]["rss"].append(rss)
+
+    print("\n========================================================")
+    print(f"{'Profile':<16}{'Page':<12}{'Median get() s':>16}{'Median load ms':>16}")
+    for name, result in results.items():
+        for page, timings in result["pages"].items():
+            load_times = [ms for _, ms in timings if ms is not None]
+            load_ms = f"{statistics.median(load_times):.0f}" if load_times else "n/a"
+            print(f"{name:<16}{page:<12}{statistics.median(w for w, _ in timings):>16.2f}{load_ms:>16}")
+    print("--------------------------------------------------------")
+    for name, result in results.items():
+        rss = f"{statistics.median(result['rss']):.0f} MB" if result["rss"] else "n/a (install psutil)"
+        print(f"{name:<16}browser RSS after loading all pages: {rss}")
+    print("========================================================")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    arg_parser = argparse.ArgumentParser(description="Benchmark the default vs lean Firefox profile.")
+    arg_parser.add_argument("--rounds", type=int, default=3, help="Fresh browsers started per profile")
+    args = arg_parser.parse_args()
+
+    run_benchmark(max(1, args.rounds), os.getenv("ERP_ROLL_NO"), os.getenv("ERP_PASSWORD"))
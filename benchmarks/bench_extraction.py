@@ -0,0 +1,83 @@
+"""
+Compares per-element extraction with bulk (single execute_script) extraction.
+Logs in once with ERP_ROLL_NO / ERP_PASSWORD from .env, then scrapes every section
+in both modes and prints the WebDriver round-trips and wall time of each.
+
+    python -m benchmarks.bench_extraction --rounds 3
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapper import EnhancedErpScraper, SECTION_SCRAPERS
+from utils.webdriver_metrics import CommandCounter
+
+MODES = ("per-element", "bulk")
+
+
+def run_section(scraper, section, bulk):
+    """Scrapes one section in the given mode. Returns (round-trips, seconds, data)."""
+    scraper.bulk_extraction = bulk
+    # Without a previous snapshot nothing is skipped as unchanged
+    scraper.previous_snapshot = {"fingerprints": {}, "data": {}}
+    scraper.erp_data.pop(section, None)
+    with CommandCounter(scraper.driver) as counter:
+        start = time.perf_counter()
+        getattr(scraper, SECTION_SCRAPERS[section])()
+        seconds = time.perf_counter() - start
+    return counter.total, seconds, scraper.erp_data.get(section)
+
+
+def run_benchmark(roll_no, password, sections, rounds):
+    results = {section: {mode: {"round_trips": [], "seconds": []} for mode in MODES} for section in sections}
+    mismatches = set()
+
+    with EnhancedErpScraper(roll_no, password) as scraper:
+        scraper._login()
+        for round_no in range(1, rounds + 1):
+            print(f"\n===== Round {round_no}/{rounds} =====")
+            for section in sections:
+                outputs = {}
+                # Alternate which mode goes first so neither always gets a warm page cache
+                order = MODES if round_no % 2 else tuple(reversed(MODES))
+                for mode in order:
+                    round_trips, seconds, outputs[mode] = run_section(scraper, section, bulk=(mode == "bulk"))
+                    results[section][mode]["round_trips"].append(round_trips)
+                    results[section][mode]["seconds"].append(seconds)
+                if outputs["per-element"] != outputs["bulk"]:
+                    mismatches.add(section)
+
+    print("\n========================================================")
+    print(f"{'Section':<18}{'Mode':<13}{'Round-trips':>12}{'Median s':>10}{'Max s':>8}")
+    for section in sections:
+        for mode in MODES:
+            stats = results[section][mode]
+            print(f"{section:<18}{mode:<13}{statistics.median(stats['round_trips']):>12.0f}"
+                  f"{statistics.median(stats['seconds']):>10.2f}{max(stats['seconds']):>8.2f}")
+    print("========================================================")
+    if mismatches:
+        print(f"⚠️ The two modes produced different data for: {', '.join(sorted(mismatches))}")
+    else:
+        print("✅ Both modes produced identical data for every section.")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    arg_parser = argparse.ArgumentParser(description="Benchmark per-element vs bulk DOM extraction.")
+    arg_parser.add_argument("--rounds", type=int, default=3, help="Times each section is scraped in each mode")
+    arg_parser.add_argument("--sections", nargs="+", choices=list(SECTION_SCRAPERS), default=list(SECTION_SCRAPERS),
+                            help="Sections to benchmark (default: all)")
+    args = arg_parser.parse_args()
+
+    roll_no = os.getenv("ERP_ROLL_NO")
+    password = os.getenv("ERP_PASSWORD")
+    if not roll_no or not password:
+        print("❌ Error: Set ERP_ROLL_NO and ERP_PASSWORD in your .env file.")
+        exit()
+
+    run_benchmark(roll_no, password, args.sections, max(1, args.rounds))
@@ -0,0 +1,88 @@
+"""
+Load test for the shared LLM client. Simulates concurrent chat users streaming answers,
+against benchmarks/fake_llm_server.py (started automatically) or any --base-url, and
+prints time-to-first-token and total latency percentiles, throughput and client stats.
+
+    python -m benchmarks.bench_llm_client --users 20 --requests 5 --error-rate 0.05
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_llm_server import start_fake_llm_server
+from utils.llm_client import LlmClient
+from utils.percentiles import percentile
+
+MESSAGES = [
+    {"role": "system", "content": "You are Superior University's AI Assistant."},
+    {"role": "user", "content": "What is the attendance policy?"},
+]
+
+
+def one_request(client, model):
+    """Streams one answer. Returns (ttft, total seconds) or None if it failed."""
+    start = time.perf_counter()
+    first_token_at = None
+    try:
+        for chunk in client.stream_chat(MESSAGES, model=model, temperature=0):
+            if first_token_at is None and chunk.choices and chunk.choices[0].delta.content:
+                first_token_at = time.perf_counter()
+    except Exception as e:
+        print(f"    - ⚠️ Request failed: {e}")
+        return None
+    end = time.perf_counter()
+    return (first_token_at or end) - start, end - start
+
+
+def run_load_test(client, model, users, requests_per_user):
+    def user_session(_):
+        return [one_request(client, model) for _ in range(requests_per_user)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        results = [r for session in executor.map(user_session, range(users)) for r in session]
+    elapsed = time.perf_counter() - start
+
+    succeeded = [r for r in results if r is not None]
+    print("\n========================================================")
+    print(f"Requests: {len(results)} ({len(results) - len(succeeded)} failed) in {elapsed:.2f}s "
+          f"-> {len(succeeded) / elapsed:.1f} answers/s")
+    if succeeded:
+        ttfts = [t for t, _ in succeeded]
+        totals = [t for _, t in succeeded]
+        print(f"TTFT     p50 {statistics.median(ttfts):.3f}s  p95 {percentile(ttfts, 0.95):.3f}s  max {max(ttfts):.3f}s")
+        print(f"Latency  p50 {statistics.median(totals):.3f}s  p95 {percentile(totals, 0.95):.3f}s  max {max(totals):.3f}s")
+    print(f"Client:  {client.stats()}")
+    print("========================================================")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Load test the pooled LLM client.")
+    arg_parser.add_argument("--users", type=int, default=10, help="Concurrent chat users")
+    arg_parser.add_argument("--requests", type=int, default=5, help="Answers streamed per user")
+    arg_parser.add_argument("--concurrency", type=int, default=8, help="Client concurrency limit")
+    arg_parser.add_argument("--base-url", help="Use this API instead of starting the fake server")
+    arg_parser.add_argument("--model", default="llama3-8b-8192")
+    arg_parser.add_argument("--ttft", type=float, default=300, help="Fake server: milliseconds before the first token")
+    arg_parser.add_argument("--tokens-per-second", type=float, default=200.0, help="Fake server: streaming speed")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="Fake server: share of 429/503 answers")
+    args = arg_parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server, base_url = start_fake_llm_server(ttft=args.ttft / 1000, tokens_per_second=args.tokens_per_second,
+                                                 error_rate=args.error_rate)
+    client = LlmClient(api_key=os.getenv("GROQ_API_KEY") or "not-needed", base_url=base_url,
+                       max_concurrency=args.concurrency, max_connections=args.concurrency)
+    try:
+        run_load_test(client, args.model, max(1, args.users), max(1, args.requests))
+    finally:
+        client.close()
+        if server is not None:
+            server.shutdown()
@@ -0,0 +1,100 @@
+"""
+Compound questions, retrieved sub-query by sub-query (an encode and a ChromaDB query each)
+versus in one batch (one encode call, one ChromaDB query with several embeddings).
+Compound questions are made by joining pairs of questions from
+benchmarks/fixtures/retrieval_queries.json with "and"; a part counts as covered when one
+of its relevant chunks is in the merged context. Prints p50/p95 latency and coverage.
+
+    python -m benchmarks.bench_multi_query --pairs 15 --repeat 5
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chromadb
+from sentence_transformers import SentenceTransformer
+from benchmarks.bench_retrieval import (
+    QUERIES_FILE, DATABASE_PATH, CHUNKS_FILE, BM25_INDEX_FILE, COLLECTION_NAME, EMBEDDING_MODEL_NAME,
+)
+from utils.bm25_index import load_or_build_index
+from utils.hybrid_search import hybrid_search, multi_hybrid_search, split_question
+from utils.percentiles import percentile
+
+
+def sequential(model, collection, bm25_index, question, top_k, candidates):
+    """One full retrieval per sub-query, merged in turn without duplicates."""
+    per_query = []
+    for sub_query in split_question(question):
+        embedding = model.encode(sub_query).tolist()
+        per_query.append(hybrid_search(collection, bm25_index, sub_query, embedding, top_k=top_k,
+                                       candidates=candidates)['ids'][0])
+    merged = []
+    for rank in range(top_k):
+        for ids in per_query:
+            if rank < len(ids) and ids[rank] not in merged:
+                merged.append(ids[rank])
+    return merged[:top_k]
+
+
+def batched(model, collection, bm25_index, question, top_k, candidates):
+    sub_queries = split_question(question)
+    embeddings = [e.tolist() for e in model.encode(sub_queries)]
+    return multi_hybrid_search(collection, bm25_index, sub_queries, embeddings, top_k=top_k,
+                               candidates=candidates)['ids'][0]
+
+
+def run(name, retrieve, compound_questions, repeat):
+    latencies = []
+    covered = parts = 0
+    for question, relevant_sets in compound_questions:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            ids = retrieve(question)
+            latencies.append(time.perf_counter() - start)
+        parts += len(relevant_sets)
+        covered += sum(bool(set(ids) & relevant) for relevant in relevant_sets)
+    print(f"\n{name}")
+    print(f"  latency  p50 {statistics.median(latencies) * 1000:.1f}ms  p95 {percentile(latencies, 0.95) * 1000:.1f}ms")
+    print(f"  parts covered {covered}/{parts}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark batched multi-query retrieval.")
+    arg_parser.add_argument("--pairs", type=int, default=15, help="Compound questions to build")
+    arg_parser.add_argument("--top-k", type=int, default=7)
+    arg_parser.add_argument("--candidates", type=int, default=20)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--seed", type=int, default=7)
+    args = arg_parser.parse_args()
+
+    with open(QUERIES_FILE, "r", encoding="utf-8") as f:
+        queries = json.load(f)
+    rng = random.Random(args.seed)
+    compound_questions = []
+    for _ in range(args.pairs):
+        first, second = rng.sample(queries, 2)
+        question = f"{first['query'].rstrip('?')} and {second['query'][0].lower()}{second['query'][1:]}"
+        compound_questions.append((question, [set(first["relevant"]), set(second["relevant"])]))
+
+    print("--- Loading embedding model, vector store and BM25 index ---")
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME, trust_remote_code=True)
+    collection = chromadb.PersistentClient(path=DATABASE_PATH).get_collection(COLLECTION_NAME)
+    bm25_index = load_or_build_index(CHUNKS_FILE, BM25_INDEX_FILE)
+    model.encode("warm up")
+
+    split = sum(len(split_question(q)) > 1 for q, _ in compound_questions)
+    print("\n========================================================")
+    print(f"{len(compound_questions)} compound questions ({split} split into sub-queries), top_k={args.top_k}")
+    run("Sequential (encode + query per sub-query)",
+        lambda q: sequential(model, collection, bm25_index, q, args.top_k, args.candidates),
+        compound_questions, args.repeat)
+    run("Batched (one encode, one ChromaDB query)",
+        lambda q: batched(model, collection, bm25_index, q, args.top_k, args.candidates),
+        compound_questions, args.repeat)
+    print("========================================================")
@@ -0,0 +1,71 @@
+"""
+Prompt size before and after context packing. For each question in
+benchmarks/fixtures/retrieval_queries.json the top chunks are retrieved with the BM25
+index (no vector store needed), then the handbook excerpts are counted as they used to be
+sent (raw HTML, every chunk) and as the ContextPacker sends them (compacted, budgeted).
+The timetable of a saved student JSON is counted indented and minified.
+
+    python -m benchmarks.bench_prompt_tokens --top-k 8 --budget 1500
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.bm25_index import load_or_build_index
+from utils.context_packer import ContextPacker, TokenCounter, minify_json
+from utils.table_format import compact_tables
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUERIES_FILE = os.path.join(ROOT, "benchmarks", "fixtures", "retrieval_queries.json")
+CHUNKS_FILE = os.path.join(ROOT, "final_chunked_data.json")
+BM25_INDEX_FILE = os.path.join(ROOT, "data", "bm25_index.json")
+EXCERPT_HEADING = "--- Handbook Excerpt ---\n"
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark prompt tokens with and without context packing.")
+    arg_parser.add_argument("--top-k", type=int, default=8)
+    arg_parser.add_argument("--budget", type=int, default=6000, help="Prompt token budget")
+    arg_parser.add_argument("--fixed-tokens", type=int, default=600,
+                            help="Tokens of system prompt, summary and question assumed per request")
+    arg_parser.add_argument("--student-file", help="Saved student JSON whose timetable is measured")
+    args = arg_parser.parse_args()
+
+    with open(QUERIES_FILE, "r", encoding="utf-8") as f:
+        queries = json.load(f)
+    bm25_index = load_or_build_index(CHUNKS_FILE, BM25_INDEX_FILE)
+    counter = TokenCounter()
+    packer = ContextPacker(counter, budget_tokens=args.budget)
+    fixed_text = "x " * args.fixed_tokens  # Stands in for the fixed prompt parts
+
+    before, after, dropped = [], [], 0
+    for query in queries:
+        documents = [bm25_index.get(doc_id)[0] for doc_id, _ in bm25_index.search(query["query"], top_k=args.top_k)]
+        before.append(sum(counter.count(EXCERPT_HEADING) + counter.count(doc) for doc in documents))
+        _, report = packer.pack([fixed_text], documents, document_prefix=EXCERPT_HEADING)
+        after.append(report["context_tokens"])
+        dropped += report["dropped"]
+
+    print("\n========================================================")
+    print(f"{len(queries)} questions, top {args.top_k} chunks, budget {args.budget} "
+          f"({'estimated' if counter.approximate else counter.encoding_name} tokens)")
+    print(f"Excerpt tokens  raw     mean {statistics.mean(before):.0f}  max {max(before)}")
+    print(f"Excerpt tokens  packed  mean {statistics.mean(after):.0f}  max {max(after)}  "
+          f"({dropped} excerpts dropped for the budget)")
+
+    # Every chunk that contains a table, raw vs compacted
+    tables = [doc for doc in bm25_index.documents if "<table" in doc]
+    raw_tables = sum(counter.count(doc) for doc in tables)
+    print(f"Table chunks    {len(tables)}: {raw_tables} tokens as HTML, "
+          f"{sum(counter.count(compact_tables(doc)) for doc in tables)} as markdown")
+
+    if args.student_file:
+        with open(args.student_file, "r", encoding="utf-8") as f:
+            timetable = json.load(f).get("timetable", {})
+        print(f"Timetable       {counter.count(json.dumps(timetable, indent=2))} tokens indented, "
+              f"{counter.count(minify_json(timetable))} minified")
+    print("========================================================")
@@ -0,0 +1,72 @@
+"""
+Shows what embedding only the question (instead of "Student Summary: ...\\nUser's Question: ...")
+does for the shared query-embedding cache. Simulates students who each ask a few of the
+questions in benchmarks/fixtures/retrieval_queries.json, encodes every query through an
+EmbeddingCache in both modes, and prints the cache hit rate and p50/p95 encode latency.
+
+    python -m benchmarks.bench_query_embedding --students 50 --questions 6
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentence_transformers import SentenceTransformer
+from benchmarks.bench_retrieval import QUERIES_FILE, EMBEDDING_MODEL_NAME
+from utils.embedding_cache import EmbeddingCache
+from utils.percentiles import percentile
+
+
+def student_summary(index, rng):
+    """A summary in the shape of format_student_data_for_prompt's, different for every student."""
+    return (f"### Student Profile\n- **Name:** Student {index}\n- **Roll No:** SU92-BSCS-F23-{index:03d}\n"
+            f"- **Semester:** {rng.randint(1, 8)}th\n- **CGPA:** {rng.uniform(1.5, 4.0):.2f}\n"
+            f"### Financial Status\n- **Total Remaining Balance:** {rng.choice([0, 15000, 42000])}")
+
+
+def run_mode(name, model, sessions, build_text, cache_size):
+    cache = EmbeddingCache(model, max_entries=cache_size)
+    latencies = []
+    for summary, questions in sessions:
+        for question in questions:
+            start = time.perf_counter()
+            cache.encode(build_text(summary, question))
+            latencies.append(time.perf_counter() - start)
+    stats = cache.stats()
+    print(f"\n{name}")
+    print(f"  lookups {len(latencies)}  model calls {stats['misses']}  hit rate {stats['hit_rate']:.1%}")
+    print(f"  latency  p50 {statistics.median(latencies) * 1000:.2f}ms  p95 {percentile(latencies, 0.95) * 1000:.2f}ms  "
+          f"total {sum(latencies):.2f}s")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark question-only vs summary-augmented query embeddings.")
+    arg_parser.add_argument("--students", type=int, default=50)
+    arg_parser.add_argument("--questions", type=int, default=6, help="Questions asked per student")
+    arg_parser.add_argument("--cache-size", type=int, default=2048)
+    arg_parser.add_argument("--seed", type=int, default=7)
+    args = arg_parser.parse_args()
+
+    with open(QUERIES_FILE, "r", encoding="utf-8") as f:
+        questions = [q["query"] for q in json.load(f)]
+    rng = random.Random(args.seed)
+    sessions = [
+        (student_summary(i, rng), rng.sample(questions, min(args.questions, len(questions))))
+        for i in range(args.students)
+    ]
+
+    print("--- Loading embedding model ---")
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME, trust_remote_code=True)
+    model.encode("warm up")
+
+    print("\n========================================================")
+    print(f"{args.students} students x {args.questions} questions from a pool of {len(questions)}")
+    run_mode("Summary + question (before)", model, sessions,
+             lambda summary, question: f"Student Summary: {summary}\nUser's Question: {question}", args.cache_size)
+    run_mode("Question only (now)", model, sessions, lambda summary, question: question, args.cache_size)
+    print("========================================================")
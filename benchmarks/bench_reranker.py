@@ -0,0 +1,90 @@
+"""
+Measures the cross-encoder reranking stage on the labelled questions in
+benchmarks/fixtures/retrieval_queries.json. Prints recall@k and MRR of the fused hybrid
+order against the reranked order, and p50/p95 rerank latency with a cold score cache
+(every chunk scored) and a warm one, plus how often the budget forced a fallback.
+
+    python -m benchmarks.bench_reranker --candidates 30 --budget-ms 250 --repeat 10
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chromadb
+from sentence_transformers import SentenceTransformer, CrossEncoder
+from benchmarks.bench_retrieval import (
+    QUERIES_FILE, DATABASE_PATH, CHUNKS_FILE, BM25_INDEX_FILE, COLLECTION_NAME, EMBEDDING_MODEL_NAME,
+    evaluate,
+)
+from utils.bm25_index import load_or_build_index
+from utils.hybrid_search import hybrid_search
+from utils.reranker import Reranker
+from utils.percentiles import percentile
+
+RERANK_MODEL_NAME = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+
+def time_reranks(reranker, queries, candidate_sets, top_k, repeat, cold):
+    latencies = []
+    fallbacks_before = reranker.stats()["fallbacks"]
+    with contextlib.redirect_stdout(io.StringIO()):  # Skip the per-query log lines
+        for query, candidates in zip(queries, candidate_sets):
+            for _ in range(repeat):
+                if cold:
+                    reranker.clear()
+                start = time.perf_counter()
+                reranker.rerank(query["query"], candidates, top_k=top_k)
+                latencies.append(time.perf_counter() - start)
+    fallbacks = reranker.stats()["fallbacks"] - fallbacks_before
+    label = "cold cache" if cold else "warm cache"
+    print(f"  {label}  p50 {statistics.median(latencies) * 1000:.1f}ms  p95 {percentile(latencies, 0.95) * 1000:.1f}ms  "
+          f"max {max(latencies) * 1000:.1f}ms  fallbacks {fallbacks}/{len(latencies)}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark cross-encoder reranking latency and recall.")
+    arg_parser.add_argument("--top-k", type=int, default=5)
+    arg_parser.add_argument("--candidates", type=int, default=30, help="Fused chunks passed to the reranker")
+    arg_parser.add_argument("--batch-size", type=int, default=16)
+    arg_parser.add_argument("--budget-ms", type=float, default=250)
+    arg_parser.add_argument("--model", default=RERANK_MODEL_NAME)
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query")
+    args = arg_parser.parse_args()
+
+    with open(QUERIES_FILE, "r", encoding="utf-8") as f:
+        queries = json.load(f)
+
+    print("--- Loading models, vector store and BM25 index ---")
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME, trust_remote_code=True)
+    collection = chromadb.PersistentClient(path=DATABASE_PATH).get_collection(COLLECTION_NAME)
+    bm25_index = load_or_build_index(CHUNKS_FILE, BM25_INDEX_FILE)
+    reranker = Reranker(CrossEncoder(args.model, device="cpu"), batch_size=args.batch_size, budget_ms=args.budget_ms)
+    embeddings = [e.tolist() for e in model.encode([q["query"] for q in queries])]
+    candidate_sets = [
+        hybrid_search(collection, bm25_index, q["query"], emb, top_k=args.candidates, candidates=args.candidates)
+        for q, emb in zip(queries, embeddings)
+    ]
+    by_query = {q["query"]: candidates for q, candidates in zip(queries, candidate_sets)}
+
+    print("\n========================================================")
+    print(f"{len(queries)} questions, {args.candidates} candidates, top_k={args.top_k}, "
+          f"batch {args.batch_size}, budget {args.budget_ms:.0f}ms")
+    evaluate("Hybrid, fused order", lambda text, emb: {
+        key: [value[0][:args.top_k]] for key, value in by_query[text].items()
+    }, queries, embeddings, 1)
+    # Recall without the budget, i.e. what the cross-encoder itself achieves
+    unbounded = Reranker(reranker.model, batch_size=args.batch_size, budget_ms=float("inf"))
+    evaluate("Hybrid + cross-encoder rerank", lambda text, emb: unbounded.rerank(text, by_query[text], args.top_k),
+             queries, embeddings, 1)
+    print("\nRerank latency")
+    time_reranks(reranker, queries, candidate_sets, args.top_k, args.repeat, cold=True)
+    time_reranks(reranker, queries, candidate_sets, args.top_k, args.repeat, cold=False)
+    print(f"  {reranker.stats()}")
+    print("========================================================")
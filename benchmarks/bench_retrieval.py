@@ -0,0 +1,90 @@
+"""
+Compares dense-only retrieval (one ChromaDB query) with hybrid BM25 + dense retrieval
+fused by reciprocal rank. Runs the labelled questions in benchmarks/fixtures/retrieval_queries.json
+("semantic" paraphrases and "exact" rule numbers/terms) and prints recall@k, MRR and
+retrieval latency for both paths. Query embeddings are computed once up front, so the
+latency is that of the search itself.
+
+    python -m benchmarks.bench_retrieval --top-k 5 --repeat 20
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chromadb
+from sentence_transformers import SentenceTransformer
+from utils.bm25_index import load_or_build_index
+from utils.hybrid_search import hybrid_search
+from utils.percentiles import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUERIES_FILE = os.path.join(ROOT, "benchmarks", "fixtures", "retrieval_queries.json")
+DATABASE_PATH = os.path.join(ROOT, "university_db1")
+CHUNKS_FILE = os.path.join(ROOT, "final_chunked_data.json")
+BM25_INDEX_FILE = os.path.join(ROOT, "data", "bm25_index.json")
+COLLECTION_NAME = "university_handbook"
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+def dense_search(collection, query_embedding, top_k):
+    return collection.query(query_embeddings=[query_embedding], n_results=top_k, include=['documents', 'metadatas'])
+
+
+def evaluate(name, search, queries, embeddings, repeat):
+    """Runs every query `repeat` times. Returns a summary dict and prints it by query kind."""
+    latencies = []
+    per_kind = {}
+    for query, embedding in zip(queries, embeddings):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = search(query["query"], embedding)
+            latencies.append(time.perf_counter() - start)
+        ids = results['ids'][0]
+        relevant = set(query["relevant"])
+        rank = next((i for i, doc_id in enumerate(ids, start=1) if doc_id in relevant), None)
+        stats = per_kind.setdefault(query["kind"], {"hits": 0, "reciprocal_ranks": [], "queries": 0})
+        stats["queries"] += 1
+        stats["hits"] += rank is not None
+        stats["reciprocal_ranks"].append(1 / rank if rank else 0.0)
+
+    print(f"\n{name}")
+    print(f"  latency  p50 {statistics.median(latencies) * 1000:.2f}ms  p95 {percentile(latencies, 0.95) * 1000:.2f}ms")
+    for kind, stats in sorted(per_kind.items()):
+        print(f"  {kind:<9} recall {stats['hits']}/{stats['queries']}  "
+              f"MRR {statistics.mean(stats['reciprocal_ranks']):.3f}")
+    total_hits = sum(s["hits"] for s in per_kind.values())
+    print(f"  overall   recall {total_hits}/{len(queries)}")
+    return total_hits
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark dense-only vs hybrid retrieval.")
+    arg_parser.add_argument("--top-k", type=int, default=5)
+    arg_parser.add_argument("--candidates", type=int, default=20, help="Chunks each retriever proposes before fusion")
+    arg_parser.add_argument("--rrf-k", type=int, default=60)
+    arg_parser.add_argument("--repeat", type=int, default=10, help="Timed runs per query")
+    args = arg_parser.parse_args()
+
+    with open(QUERIES_FILE, "r", encoding="utf-8") as f:
+        queries = json.load(f)
+
+    print("--- Loading embedding model, vector store and BM25 index ---")
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME, trust_remote_code=True)
+    collection = chromadb.PersistentClient(path=DATABASE_PATH).get_collection(COLLECTION_NAME)
+    bm25_index = load_or_build_index(CHUNKS_FILE, BM25_INDEX_FILE)
+    embeddings = [e.tolist() for e in model.encode([q["query"] for q in queries])]
+
+    print("\n========================================================")
+    print(f"{len(queries)} questions, top_k={args.top_k}")
+    evaluate("Dense only", lambda text, emb: dense_search(collection, emb, args.top_k),
+             queries, embeddings, args.repeat)
+    evaluate(f"Hybrid (BM25 + dense, {args.candidates} candidates each, RRF k={args.rrf_k})",
+             lambda text, emb: hybrid_search(collection, bm25_index, text, emb, top_k=args.top_k,
+                                             candidates=args.candidates, rrf_k=args.rrf_k),
+             queries, embeddings, args.repeat)
+    print("========================================================")
@@ -0,0 +1,140 @@
+"""
+Benchmarks every section scraper against the offline replay of the ERP portal.
+Starts benchmarks/replay_server.py on a free port, logs in once and scrapes each
+section `--rounds` times, printing the wall time, WebDriver round-trips and peak
+Python memory (tracemalloc) of each.
+
+    python -m benchmarks.bench_scraper --rounds 5 --save bench.json
+    python -m benchmarks.bench_scraper --baseline bench.json   # exits with 1 on a regression
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.replay_server import start_replay_server
+from utils.webdriver_metrics import CommandCounter
+from utils.percentiles import percentile
+
+# A section regresses when its median time or round-trips grow by more than this fraction
+DEFAULT_TOLERANCE = 0.25
+# Medians below this many seconds are too noisy to compare
+MIN_COMPARED_SECONDS = 0.05
+
+
+def measure_section(scraper, section):
+    """Scrapes one section from scratch. Returns (seconds, round-trips, peak bytes, succeeded)."""
+    scraper.previous_snapshot = {"fingerprints": {}, "data": {}}
+    scraper.erp_data.pop(section, None)
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    with CommandCounter(scraper.driver) as counter:
+        seconds = scraper._run_section(section)
+    _, peak = tracemalloc.get_traced_memory()
+    return seconds, counter.total, peak - before, section in scraper.erp_data
+
+
+def run_benchmark(rounds, backend, latency, bulk_extraction):
+    server, base_url = start_replay_server(latency=latency)
+    # URLS is built from ERP_BASE_URL when scrapper is first imported
+    os.environ["ERP_BASE_URL"] = base_url
+    from scrapper import EnhancedErpScraper, SECTION_SCRAPERS, URLS
+    from utils.http_backend import ErpHttpSession
+    if not URLS["login"].startswith(base_url):
+        raise RuntimeError("scrapper was imported before the replay server's ERP_BASE_URL was set.")
+
+    samples = {section: [] for section in SECTION_SCRAPERS}
+    failures = set()
+    tracemalloc.start()
+    try:
+        with EnhancedErpScraper("replay", "replay", backend=backend, bulk_extraction=bulk_extraction) as scraper:
+            login_start = time.perf_counter()
+            scraper._login()
+            print(f"--- Logged in to the replay server in {time.perf_counter() - login_start:.2f}s ---")
+            if backend == "http":
+                scraper.http = ErpHttpSession.from_driver(scraper.driver)
+            for round_no in range(1, rounds + 1):
+                print(f"\n===== Round {round_no}/{rounds} =====")
+                for section in SECTION_SCRAPERS:
+                    seconds, round_trips, peak_bytes, succeeded = measure_section(scraper, section)
+                    samples[section].append({"seconds": seconds, "round_trips": round_trips, "peak_bytes": peak_bytes})
+                    if not succeeded:
+                        failures.add(section)
+            if scraper.http is not None:
+                scraper.http.close()
+    finally:
+        tracemalloc.stop()
+        server.shutdown()
+
+    report = {}
+    for section, runs in samples.items():
+        seconds = [r["seconds"] for r in runs]
+        report[section] = {
+            "median_seconds": statistics.median(seconds),
+            "p95_seconds": percentile(seconds, 0.95),
+            "round_trips": statistics.median(r["round_trips"] for r in runs),
+            "peak_kib": max(r["peak_bytes"] for r in runs) / 1024,
+        }
+    return report, failures
+
+
+def print_report(report, failures):
+    print("\n========================================================")
+    print(f"{'Section':<18}{'Median s':>10}{'p95 s':>8}{'Round-trips':>13}{'Peak KiB':>10}")
+    for section, stats in report.items():
+        print(f"{section:<18}{stats['median_seconds']:>10.3f}{stats['p95_seconds']:>8.3f}"
+              f"{stats['round_trips']:>13.0f}{stats['peak_kib']:>10.0f}")
+    print("========================================================")
+    if failures:
+        print(f"⚠️ No data was scraped for: {', '.join(sorted(failures))}")
+
+
+def find_regressions(report, baseline, tolerance):
+    """Sections whose median time or round-trips grew by more than `tolerance` over the baseline."""
+    regressions = []
+    for section, stats in report.items():
+        before = baseline.get(section)
+        if not before:
+            continue
+        if stats["round_trips"] > before["round_trips"] * (1 + tolerance):
+            regressions.append(f"{section}: round-trips {before['round_trips']:.0f} -> {stats['round_trips']:.0f}")
+        if (stats["median_seconds"] >= MIN_COMPARED_SECONDS
+                and stats["median_seconds"] > before["median_seconds"] * (1 + tolerance)):
+            regressions.append(f"{section}: median {before['median_seconds']:.3f}s -> {stats['median_seconds']:.3f}s")
+    return regressions
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark the ERP scraper against recorded pages.")
+    arg_parser.add_argument("--rounds", type=int, default=5, help="Times each section is scraped")
+    arg_parser.add_argument("--backend", choices=("selenium", "http"), default="selenium")
+    arg_parser.add_argument("--per-element", action="store_true", help="Disable bulk DOM extraction")
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="Milliseconds added to every response")
+    arg_parser.add_argument("--save", help="Write the results to this JSON file")
+    arg_parser.add_argument("--baseline", help="Compare with results saved earlier by --save")
+    arg_parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                            help="Allowed growth over the baseline before it counts as a regression")
+    args = arg_parser.parse_args()
+
+    report, failures = run_benchmark(max(1, args.rounds), args.backend, args.latency / 1000, not args.per_element)
+    print_report(report, failures)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+        print(f"Results saved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = find_regressions(report, json.load(f), args.tolerance)
+        if regressions:
+            print("❌ Performance regressions against the baseline:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print("✅ No regressions against the baseline.")
@@ -0,0 +1,132 @@
+"""
+A local stand-in for the Groq chat completions API (OpenAI-compatible), for load tests.
+It answers every request with a fixed text, streamed at a configurable speed, and can
+fail a share of requests with 429/503 to exercise the client's retries.
+
+    python -m benchmarks.fake_llm_server --port 8766 --ttft 300 --tokens-per-second 200
+    LLM_BASE_URL=http://127.0.0.1:8766 streamlit run run_assistant.py
+"""
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+DEFAULT_PORT = 8766
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+ANSWER = ("According to the university handbook, students must maintain at least 75% attendance "
+          "in every course to be eligible for the final examination. ")
+
+
+class FakeLlmHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+    ttft = 0.3
+    tokens_per_second = 200.0
+    answer_tokens = 60
+    error_rate = 0.0
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _tokens(self):
+        words = ANSWER.split(" ")
+        return [words[i % len(words)] + " " for i in range(self.answer_tokens)]
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        if self.path.rstrip("/") != COMPLETIONS_PATH:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        if random.random() < self.error_rate:
+            status = random.choice((429, 503))
+            self._send_json(status, {"error": {"message": "Simulated failure"}}, headers={"Retry-After": "0.2"})
+            return
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        model = request.get("model", "fake-model")
+        tokens = self._tokens()
+        usage = {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)}
+        time.sleep(self.ttft)
+
+        if not request.get("stream"):
+            time.sleep(len(tokens) / self.tokens_per_second)
+            self._send_json(200, {
+                "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send_event(data):
+            payload = f"data: {data}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(payload):X}\r\n".encode("ascii") + payload + b"\r\n")
+            self.wfile.flush()
+
+        def chunk(delta, finish_reason=None, extra=None):
+            return json.dumps({
+                "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}], **(extra or {}),
+            })
+
+        try:
+            send_event(chunk({"role": "assistant", "content": ""}))
+            for token in tokens:
+                send_event(chunk({"content": token}))
+                time.sleep(1 / self.tokens_per_second)
+            send_event(chunk({}, finish_reason="stop", extra={"x_groq": {"id": completion_id, "usage": usage}}))
+            send_event("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client cancelled the stream
+
+    def log_message(self, format, *args):
+        pass  # Keep load test output readable
+
+
+def start_fake_llm_server(port=0, ttft=0.3, tokens_per_second=200.0, answer_tokens=60, error_rate=0.0):
+    """
+    Starts the fake API on a background thread.
+    Returns (server, base_url); port=0 picks a free port. Stop it with server.shutdown().
+    """
+    handler = type("ConfiguredFakeLlmHandler", (FakeLlmHandler,), {
+        "ttft": ttft, "tokens_per_second": tokens_per_second,
+        "answer_tokens": answer_tokens, "error_rate": error_rate,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Serve a fake Groq/OpenAI chat completions API.")
+    arg_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    arg_parser.add_argument("--ttft", type=float, default=300, help="Milliseconds before the first token")
+    arg_parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    arg_parser.add_argument("--tokens", type=int, default=60, help="Tokens in every answer")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 429/503")
+    args = arg_parser.parse_args()
+
+    server, base_url = start_fake_llm_server(args.port, args.ttft / 1000, args.tokens_per_second,
+                                             args.tokens, args.error_rate)
+    print(f"--- Fake LLM API at {base_url} (set LLM_BASE_URL to use it) ---")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
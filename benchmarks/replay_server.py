@@ -0,0 +1,105 @@
+"""
+A local stand-in for the ERP portal that serves the recorded pages in benchmarks/fixtures.
+Point the scraper at it with ERP_BASE_URL:
+
+    python -m benchmarks.replay_server --port 8765 --latency 50
+    ERP_BASE_URL=http://127.0.0.1:8765 python erp_login_automation.py
+
+Any roll number and password log in. Responses carry an ETag so the HTTP
+backend's conditional requests can be exercised too.
+"""
+import os
+import time
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+FIXTURES_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DEFAULT_PORT = 8765
+
+# URL path -> fixture file, mirroring the paths in scrapper.URL_PATHS
+ROUTES = {
+    "/web/login": "login.html",
+    "/students/dashboard": "dashboard.html",
+    "/student/attendance": "attendance.html",
+    "/student/attendance/detail/1": "attendance_detail_1.html",
+    "/student/attendance/detail/2": "attendance_detail_2.html",
+    "/student/attendance/detail/3": "attendance_detail_3.html",
+    "/student/results": "results.html",
+    "/student/invoices": "invoices.html",
+    "/student/class/schedule": "timetable.html",
+}
+
+
+def _load_fixtures():
+    pages = {}
+    for path, file_name in ROUTES.items():
+        with open(os.path.join(FIXTURES_FOLDER, file_name), 'rb') as f:
+            body = f.read()
+        pages[path] = (body, '"' + hashlib.sha256(body).hexdigest()[:16] + '"')
+    return pages
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    pages = {}
+    # Seconds added to every response to imitate the network round-trip to the portal
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        path = self.path.split("?", 1)[0].rstrip("/") or "/"
+        if path not in self.pages:
+            self.send_error(404, "No fixture recorded for this page")
+            return
+        body, etag = self.pages[path]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        # The login form: accept any credentials and go to the dashboard like the portal does
+        time.sleep(self.latency)
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.send_response(303)
+        self.send_header("Location", "/students/dashboard")
+        self.send_header("Set-Cookie", "session_id=replay; Path=/")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+
+def start_replay_server(port=0, latency=0.0):
+    """
+    Starts the replay server on a background thread.
+    Returns (server, base_url); port=0 picks a free port. Stop it with server.shutdown().
+    """
+    handler = type("ConfiguredReplayHandler", (ReplayHandler,), {"pages": _load_fixtures(), "latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Serve the recorded ERP pages locally.")
+    arg_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="Milliseconds added to every response")
+    args = arg_parser.parse_args()
+
+    server, base_url = start_replay_server(args.port, args.latency / 1000)
+    print(f"--- Replaying the ERP portal at {base_url} (set ERP_BASE_URL to use it) ---")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
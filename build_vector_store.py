@@ -1,6 +1,7 @@
 import json
 import chromadb
 from sentence_transformers import SentenceTransformer
+from utils.bm25_index import load_or_build_index
 
 def load_final_chunks(file_path):
     """Loads the final, chunked data from a JSON file."""
@@ -35,13 +36,15 @@ def build_vector_store(chunks, collection_name, embedding_model_name):
     print(f"Processing {len(chunks)} chunks to add to the vector store...")
     
     # Prepare data for ChromaDB
+    # Tables are stored as dense markdown (what the prompt gets) but embedded from their short text form
     documents = [chunk['content'] for chunk in chunks]
+    embedding_texts = [chunk.get('embedding_text', chunk['content']) for chunk in chunks]
     metadatas = [chunk['metadata'] for chunk in chunks]
     ids = [f"chunk_{i}" for i in range(len(chunks))] # Create a unique ID for each chunk
 
     # Generate embeddings for all documents in batches
     print("Generating embeddings for all documents... (This may take a while)")
-    embeddings = embedding_model.encode(documents, show_progress_bar=True)
+    embeddings = embedding_model.encode(embedding_texts, show_progress_bar=True)
     
     # Add to ChromaDB collection
     print("Adding documents, embeddings, and metadata to ChromaDB...")
@@ -64,4 +67,6 @@ if __name__ == "__main__":
     
     final_chunks = load_final_chunks(input_file)
     if final_chunks:
-        build_vector_store(final_chunks, collection_name, model_name)
\ No newline at end of file
+        build_vector_store(final_chunks, collection_name, model_name)
+        # The keyword index used next to the vectors for hybrid search
+        load_or_build_index(input_file, "data/bm25_index.json")
\ No newline at end of file
@@ -1,5 +1,6 @@
 import json
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from utils.table_format import compact_table_chunk
 
 def load_data(file_path):
     """Loads the extracted data from a JSON file."""
@@ -14,6 +15,7 @@ def chunk_data(chunks):
     """
     Applies a second layer of chunking to long text elements,
     while leaving tables and short elements intact.
+    Tables still stored as raw HTML (older extractions) are converted to their compact form.
     """
     if not chunks:
         return []
@@ -50,7 +52,7 @@ def chunk_data(chunks):
                 })
         else:
             # If the chunk is a table or short text, add it directly
-            final_chunks.append(chunk)
+            final_chunks.append(compact_table_chunk(chunk) if element_type == "Table" else chunk)
             
     return final_chunks
 
@@ -1,8 +1,8 @@
 import os
-import json
-import re
 from dotenv import load_dotenv
 from scrapper import EnhancedErpScraper
+from utils.scrape_cache import ScrapeCache
+from utils.session_store import SessionStore
 
 if __name__ == "__main__":
     load_dotenv()
@@ -19,20 +19,22 @@ if __name__ == "__main__":
         print(f"Created directory: '{DATA_FOLDER}'")
 
     try:
-        with EnhancedErpScraper(ROLL_NO, PASSWORD) as scraper:
-            all_data = scraper.scrape_all_data()
+        cache = ScrapeCache(DATA_FOLDER)
+        # A saved ERP session that is still valid is reused instead of logging in
+        with EnhancedErpScraper(ROLL_NO, PASSWORD, session_store=SessionStore()) as scraper:
+            # Sections unchanged since the last saved run are not parsed again
+            all_data = scraper.scrape_all_data(snapshot=cache.snapshot(ROLL_NO))
+            fingerprints = scraper.fingerprints
+            failed_sections = scraper.failed_sections
 
         if "error" in all_data:
             print("\nScraping process failed. Please check the error messages above.")
             exit()
 
-        # ✅ Save by Roll Number instead of student name
-        safe_roll_no = re.sub(r'[\\/*?:"<>|]', "", ROLL_NO).replace(' ', '_')
-        file_path = os.path.join(DATA_FOLDER, f"{safe_roll_no}.json")
-
+        # ✅ Save by Roll Number through the cache, so the app can serve it on the next login
         print(f"\n--- Saving All Data ---")
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(all_data, f, indent=4)
+        cache.save(ROLL_NO, all_data, password=PASSWORD, fingerprints=fingerprints, failed_sections=failed_sections)
+        file_path = cache.data_path(ROLL_NO)
 
         print(f"\n✅✅✅ Success! All data saved to: {file_path}")
 
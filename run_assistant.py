@@ -8,18 +8,31 @@ import streamlit as st
 import os
 import json
 import re
+import time
+import hashlib
 import chromadb
 import plotly.graph_objects as go
 import pandas as pd
 from datetime import datetime
 from dateutil import parser
-from sentence_transformers import SentenceTransformer
-from groq import Groq
+from sentence_transformers import SentenceTransformer, CrossEncoder
 from dotenv import load_dotenv, set_key
 
 # --- Import your custom modules ---
 try:
-    from scrapper import EnhancedErpScraper
+    from scrapper import EnhancedErpScraper, create_firefox_driver, SECTION_SCRAPERS, URLS, PARALLEL_WORKERS
+    from utils.driver_pool import DriverPool
+    from utils.scrape_cache import ScrapeCache
+    from utils.session_store import SessionStore
+    from utils.scrape_jobs import ScrapeJobScheduler, ACTIVE_STATUSES
+    from utils.warmup import Warmup
+    from utils.embedding_cache import EmbeddingCache
+    from utils.response_cache import ResponseCache, is_general_question, PERSONAL_PATTERN
+    from utils.bm25_index import load_or_build_index
+    from utils.hybrid_search import multi_hybrid_search, split_question
+    from utils.reranker import Reranker
+    from utils.llm_client import LlmClient
+    from utils.context_packer import ContextPacker, TokenCounter, minify_json
     from utils.notifications import format_student_report, send_twilio_whatsapp_report
     from styles.ui_components import load_custom_css, create_welcome_header, create_login_form, create_sidebar_content, create_next_class_card
     # We will use st.columns for metrics, so create_metric_cards is not needed.
@@ -33,7 +46,55 @@ DATA_FOLDER = "data"
 DATABASE_NAME = "university_db1"
 COLLECTION_NAME = "university_handbook"
 EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+# Handbook chunks behind the vector store; the keyword (BM25) index is built from them once and saved
+CHUNKS_FILE = "final_chunked_data.json"
+BM25_INDEX_FILE = os.path.join(DATA_FOLDER, "bm25_index.json")
+# Chunks each retriever proposes before reciprocal-rank fusion picks the final top_k
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "20"))
+RRF_K = 60
+# A compound question gets two more context chunks per extra part, up to this many
+MULTI_QUERY_MAX_CHUNKS = int(os.getenv("MULTI_QUERY_MAX_CHUNKS", "8"))
+# Optional ChromaDB metadata filter for retrieval, e.g. {"source_file": "superior-academic-regulations-bs-programs.pdf"}
+RETRIEVAL_FILTER = json.loads(os.getenv("RETRIEVAL_FILTER") or "null")
+# Cross-encoder reranking of the fused candidates; over its budget the fused order is kept
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "true").lower() == "true"
+RERANK_MODEL_NAME = os.getenv("RERANK_MODEL_NAME", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "30"))
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "16"))
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "250"))
 GROQ_MODEL_NAME = "llama3-8b-8192"
+# Scrape the ERP sections concurrently on several browsers (uses more memory)
+PARALLEL_SCRAPING = os.getenv("ERP_PARALLEL_SCRAPE", "false").lower() == "true"
+# "http" reads server-rendered pages without the browser; "selenium" uses Firefox for everything
+SCRAPE_BACKEND = os.getenv("ERP_SCRAPE_BACKEND", "selenium")
+# Scrapes that may run at the same time, and how often the login page polls a running one
+SCRAPE_WORKERS = int(os.getenv("ERP_SCRAPE_WORKERS", "2"))
+SCRAPE_POLL_SECONDS = 1.5
+# Warm headless browsers shared by all sessions, and how many scrapes each serves before a restart.
+# A parallel scrape borrows PARALLEL_WORKERS browsers; with fewer idle ones it runs less parallel.
+DRIVER_POOL_SIZE = int(os.getenv("ERP_DRIVER_POOL_SIZE",
+                                 str(SCRAPE_WORKERS * (PARALLEL_WORKERS if PARALLEL_SCRAPING else 1))))
+DRIVER_MAX_USES = int(os.getenv("ERP_DRIVER_MAX_USES", "20"))
+# Written once the embedding model and vector store are loaded; a readiness probe can check for it
+WARMUP_READY_FILE = os.path.join(DATA_FOLDER, "warmup_ready.json")
+WARMUP_QUERY = "What is the attendance policy?"
+# Query embeddings kept in memory and shared by every session
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))
+# Answers to general handbook questions are reused for questions at least this similar
+RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.92"))
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", str(6 * 60 * 60)))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "500"))
+# Shared LLM client: set LLM_BASE_URL to use an OpenAI-compatible stand-in instead of Groq
+LLM_BASE_URL = os.getenv("LLM_BASE_URL") or None
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+# Seconds one LLM call may spend including retries, before it gives up and frees its slot
+LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", "60"))
+# Prompt tokens allowed per request; the rest of llama3-8b-8192's window is left for the answer
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+EXCERPT_HEADING = "--- Handbook Excerpt ---\n"
 
 
 # --- 2. HELPER FUNCTIONS ---
@@ -41,62 +102,266 @@ GROQ_MODEL_NAME = "llama3-8b-8192"
 def update_env_file(key_to_update, new_value):
     set_key('.env', key_to_update, new_value)
 
+@st.cache_resource
+def get_driver_pool():
+    """Creates the process-wide pool of pre-started browsers used by every login."""
+    print(f"--- Starting WebDriver pool (size={DRIVER_POOL_SIZE}, max uses={DRIVER_MAX_USES}) ---")
+    return DriverPool(create_firefox_driver, size=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES,
+                      reset_url=URLS["login"])
+
+@st.cache_resource
+def get_scrape_cache():
+    """Creates the on-disk cache of scraped student data shared by every session."""
+    return ScrapeCache(DATA_FOLDER)
+
+@st.cache_resource
+def get_session_store():
+    """Creates the encrypted store of ERP session cookies, so refreshes can skip the login form."""
+    return SessionStore()
+
+@st.cache_resource
+def get_response_cache():
+    """Creates the semantic cache of answers to general handbook questions, shared by every session."""
+    return ResponseCache(threshold=RESPONSE_CACHE_THRESHOLD, ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_SIZE)
+
+@st.cache_resource
+def get_context_packer():
+    """Creates the prompt packer and its local tokenizer, shared by every session."""
+    return ContextPacker(TokenCounter(), budget_tokens=PROMPT_TOKEN_BUDGET)
+
+@st.cache_resource
+def get_llm_client():
+    """Creates the process-wide LLM client with its keep-alive connection pool."""
+    print(f"--- Starting LLM client (concurrency={LLM_MAX_CONCURRENCY}, base_url={LLM_BASE_URL or 'Groq'}) ---")
+    return LlmClient(
+        api_key=os.environ.get("GROQ_API_KEY"), base_url=LLM_BASE_URL, max_connections=LLM_MAX_CONNECTIONS,
+        max_concurrency=LLM_MAX_CONCURRENCY, timeout=LLM_TIMEOUT, max_retries=LLM_MAX_RETRIES,
+        deadline=LLM_DEADLINE
+    )
+
+@st.cache_resource
+def get_scrape_scheduler():
+    """Creates the process-wide background scrape scheduler."""
+    return ScrapeJobScheduler(max_workers=SCRAPE_WORKERS)
+
+def scrape_with_pooled_driver(driver_pool, cache, session_store, roll_no, password, sections=None, on_section=None):
+    """
+    Runs the scraper on a browser borrowed from the pool and returns
+    (erp_data, fingerprints, failed_sections). Sections unchanged since the cached scrape are not re-parsed,
+    and a saved ERP session is reused instead of logging in when it is still valid.
+    """
+    # The browser is handed back (wiped) to the pool afterwards.
+    with driver_pool.lease() as driver:
+        with EnhancedErpScraper(roll_no, password, driver=driver, backend=SCRAPE_BACKEND,
+                                session_store=session_store, driver_pool=driver_pool) as scraper:
+            scraped_data = scraper.scrape_all_data(
+                parallel=PARALLEL_SCRAPING, sections=sections,
+                snapshot=cache.snapshot(roll_no), on_section=on_section
+            )
+            fingerprints = scraper.fingerprints
+            failed_sections = scraper.failed_sections
+    print(f"--- WebDriver pool metrics: {driver_pool.metrics()} ---")
+    return scraped_data, fingerprints, failed_sections
+
+def submit_scrape_job(roll_no, password, sections=None):
+    """
+    Queues a scrape on the background scheduler and returns its ScrapeJob.
+    The job writes what it scraped to the cache; a scrape already in flight for the
+    same roll number and password is reused instead of starting a second one.
+    """
+    # Resolve the cached resources here, on the script thread
+    cache = get_scrape_cache()
+    session_store = get_session_store()
+    driver_pool = get_driver_pool()
+    sections = sections or list(SECTION_SCRAPERS)
+
+    def task(job):
+        scraped_data, fingerprints, failed_sections = scrape_with_pooled_driver(
+            driver_pool, cache, session_store, roll_no, password, sections=sections, on_section=job.section_finished
+        )
+        if "error" in scraped_data:
+            if scraped_data['error'].startswith("Login Failed"):
+                # Only the stored password is forgotten; a wrong guess for someone
+                # else's roll number must not wipe their cache credential or session
+                cache.forget_credential(roll_no, password)
+                session_store.forget(roll_no, password)
+            return scraped_data
+        # The ERP just accepted these credentials, so they may unlock the cache next time.
+        # Failed sections keep their last good data, which is what the session gets back.
+        return cache.save(roll_no, scraped_data, password=password, fingerprints=fingerprints,
+                          failed_sections=failed_sections)
+
+    owner_key = hashlib.sha256(f"{roll_no}:{password}".encode("utf-8")).hexdigest()
+    return get_scrape_scheduler().submit(roll_no, owner_key, sections, task)
+
 # In run_assistant.py
 
 def login_and_fetch_data(roll_no, password):
     """
-    Handles the entire login and data fetching process.
-    It runs the scraper and returns the data, designed for deployment.
+    Handles the login and data fetching process without blocking the script thread.
+    Returns cached data right away when the student has a verified cache (stale
+    sections are refreshed by a background job). Otherwise a live scrape is queued,
+    its id is kept in st.session_state.scrape_job_id and None is returned.
     This function replaces both check_and_fetch_data and run_scraper.
     """
-    # 1. Display informational messages to the user.
+    # 1. Serve the on-disk cache if this student has logged in before.
+    cache = get_scrape_cache()
+    cached_data = cache.load_verified(roll_no, password)
+    if cached_data and cached_data.get('profile'):
+        stale_sections = cache.stale_sections(roll_no)
+        if stale_sections:
+            # The dashboard follows the job and swaps in each section as it is refreshed
+            st.session_state.scrape_job_id = submit_scrape_job(roll_no, password, stale_sections).id
+            st.info(f"🔄 Refreshing in the background: {', '.join(stale_sections)}")
+        st.success("⚡ Loaded your saved data instantly!")
+        return cached_data
+
+    # 2. Otherwise queue a live scrape; main() polls it on every rerun.
+    job = submit_scrape_job(roll_no, password)
+    st.session_state.scrape_job_id = job.id
+    return None
+
+def show_scrape_progress(job):
+    """Shows the progress of a background scrape, one line per section."""
     st.info(
         "**Fetching live data from the ERP portal.** "
-        "This may take up to 2-3 minutes. Please do not close this window."
+        "This may take up to 2-3 minutes. This page updates automatically."
     )
-    
-    # 2. Run the scraper inside a spinner to show activity.
-    with st.spinner(f"🔗 Connecting to ERP and scraping data for {roll_no}..."):
-        try:
-            # The logic from your old `run_scraper` is now here.
-            # We use the 'with' statement to ensure the browser closes properly.
-            with EnhancedErpScraper(roll_no, password) as scraper:
-                scraped_data = scraper.scrape_all_data()
-        except Exception as e:
-            # Catch any unexpected errors from the scraper itself
-            st.error(f"A critical error occurred during scraping: {e}")
-            return None
-
-    # 3. Process the results.
-    if scraped_data and "error" not in scraped_data:
-        st.balloons()
-        st.success("🎉 Live data fetched successfully!")
-        return scraped_data
+    total = max(1, len(job.progress))
+    st.progress(job.done_count / total, text=f"🔗 Scraping data for {job.roll_no}: {job.done_count}/{total} sections")
+    icons = {"pending": "⏳", "done": "✅", "failed": "⚠️"}
+    for section, state in job.progress.items():
+        st.write(f"{icons[state]} {section.replace('_', ' ').title()}")
+
+def follow_scrape_job():
+    """
+    Merges the sections this session's background scrape has finished so far into
+    st.session_state.student_data. Returns the sections it is still working on.
+    """
+    job_id = st.session_state.get("scrape_job_id")
+    job = get_scrape_scheduler().get(job_id) if job_id else None
+    if job is None:
+        st.session_state.pop("scrape_job_id", None)  # The job expired or the server restarted
+        return []
+
+    st.session_state.student_data = {**st.session_state.student_data, **job.partial_data}
+    if job.status in ACTIVE_STATUSES:
+        return [section for section, state in job.progress.items() if state == "pending"]
+
+    del st.session_state.scrape_job_id
+    if job.status == "done":
+        st.session_state.student_data = {**st.session_state.student_data, **job.result}
+        # The job has written the same data to the cache
+        st.session_state.data_version = get_scrape_cache().last_updated(job.roll_no)
     else:
-        # Handle errors reported by the scraper (e.g., invalid login)
-        error_msg = scraped_data.get('error', 'an unknown error occurred') if scraped_data else 'an unknown error occurred'
-        st.error(f"❌ Failed to fetch data. Error: {error_msg}")
+        st.warning(f"⚠️ Some of your data could not be refreshed: {job.error}")
+    return []
+
+@st.fragment(run_every=SCRAPE_POLL_SECONDS)
+def watch_login_scrape(job_id):
+    """
+    Shows the progress of the login scrape, refreshing on its own every SCRAPE_POLL_SECONDS
+    without holding the script thread, and reruns the page once the dashboard can be shown.
+    """
+    job = get_scrape_scheduler().get(job_id)
+    if job is None or job.status not in ACTIVE_STATUSES or 'profile' in job.partial_data:
+        st.rerun()
+    show_scrape_progress(job)
+
+@st.fragment(run_every=SCRAPE_POLL_SECONDS)
+def watch_background_scrape(loading_sections):
+    """
+    Reruns the dashboard once the background scrape has finished more of `loading_sections`.
+    While a chat answer is streaming the rerun waits for a later tick, as it would cut the answer off.
+    """
+    if st.session_state.get("answer_in_progress"):
+        return
+    job_id = st.session_state.get("scrape_job_id")
+    job = get_scrape_scheduler().get(job_id) if job_id else None
+    if job is None or job.status not in ACTIVE_STATUSES:
+        st.rerun()
+    if [section for section, state in job.progress.items() if state == "pending"] != loading_sections:
+        st.rerun()
+
+def show_loading_notice(sections):
+    """Tells the user which sections are still being fetched."""
+    names = ", ".join(section.replace('_', ' ') for section in sections)
+    st.info(f"⏳ Still fetching your {names} from the ERP portal. This page fills in as they arrive.")
+
+def load_embedding_model(_):
+    return SentenceTransformer(EMBEDDING_MODEL_NAME, trust_remote_code=True)
+
+def create_embedding_cache(results):
+    return EmbeddingCache(results["embedding_model"], max_entries=EMBEDDING_CACHE_SIZE)
+
+def open_vector_store(_):
+    client = chromadb.PersistentClient(path=f"./{DATABASE_NAME}")
+    collection = client.get_collection(COLLECTION_NAME)
+    print(f"✅ Successfully loaded DB. Collection has {collection.count()} items.")
+    return client, collection
+
+def load_bm25_index(_):
+    return load_or_build_index(CHUNKS_FILE, BM25_INDEX_FILE)
+
+def load_reranker(_):
+    if not RERANK_ENABLED:
         return None
+    try:
+        model = CrossEncoder(RERANK_MODEL_NAME, device="cpu")
+        model.predict([(WARMUP_QUERY, WARMUP_QUERY)])  # Initialise the kernels before the first chat
+    except Exception as e:
+        # Retrieval still works without reranking
+        print(f"    - ⚠️ Could not load reranker '{RERANK_MODEL_NAME}', using fused order: {e}")
+        return None
+    return Reranker(model, batch_size=RERANK_BATCH_SIZE, budget_ms=RERANK_BUDGET_MS)
+
+def warm_encoder(results):
+    # The first encode call initialises the tokenizer and model kernels
+    return results["embedding_model"].encode(WARMUP_QUERY).tolist()
+
+def warm_vector_index(results):
+    # A real query pages the HNSW index files into memory
+    _, collection = results["vector_store"]
+    collection.query(query_embeddings=[results["warm_encoder"]], n_results=1)
 
 @st.cache_resource
+def get_warmup():
+    """
+    Starts loading the embedding model and vector store in the background, once per process.
+    Streamlit only runs this script when a browser connects, so the warm-up begins with the
+    first page view after a deploy, not when the server starts. Opening the page once from
+    a deploy hook and waiting for WARMUP_READY_FILE keeps that wait away from real users.
+    """
+    os.makedirs(DATA_FOLDER, exist_ok=True)
+    return Warmup([
+        ("embedding_model", load_embedding_model),
+        ("embedding_cache", create_embedding_cache),
+        ("vector_store", open_vector_store),
+        ("bm25_index", load_bm25_index),
+        ("reranker", load_reranker),
+        ("warm_encoder", warm_encoder),
+        ("warm_vector_index", warm_vector_index),
+    ], ready_file=WARMUP_READY_FILE).start()
+
 def initialize_components():
-    """Initializes and caches the Persistent ChromaDB client."""
-    db_path = "university_db" # Path to the folder in your repo
-    
-    print("--- Initializing Persistent ChromaDB Client ---")
-    with st.spinner("🚀 Initializing AI Assistant..."):
-        try:
-            embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME, trust_remote_code=True)
-            client = chromadb.PersistentClient(path="./university_db1")
-            collection = client.get_collection("university_handbook")
-            print(f"✅ Successfully loaded DB. Collection has {collection.count()} items.")
-
-        except Exception as e:
-            print(f"❌ FAILED to initialize PersistentClient. Error: {e}")
-            st.error(f"Fatal Error: Could not load the vector database. Error: {e}")
-            st.stop()
-            
-    return client, embedding_model
+    """Returns the ChromaDB client, embedding cache, BM25 index and reranker (or None) loaded by the warm-up."""
+    warmup = get_warmup()
+    if not warmup.done:
+        with st.spinner("🚀 Initializing AI Assistant..."):
+            warmup.wait()
+    if not warmup.ready:
+        # Forget the failed warm-up so the next page view starts a new one instead of
+        # serving this failure for the life of the process
+        get_warmup.clear()
+        # warmup.error names the step that failed
+        st.error(f"Fatal Error: The AI assistant could not be loaded. The warm-up failed after "
+                 f"{warmup.timings.get(warmup.failed_step, 0):.1f}s in {warmup.error}")
+        if st.button("🔄 Retry"):
+            st.rerun()
+        st.stop()
+    client, _ = warmup.results["vector_store"]
+    results = warmup.results
+    return client, results["embedding_cache"], results["bm25_index"], results["reranker"]
 
 def get_next_class(timetable):
     """Finds the user's next scheduled class and returns its data or a status message."""
@@ -260,29 +525,67 @@ def format_student_data_for_prompt(student_data):
 
 
 
-def retrieve_context(client, embedding_model, user_query, formatted_student_summary, top_k=5):
+def student_context_query(student_data):
+    """
+    Handbook keywords for the student's situation (low CGPA, attendance shortage, dues), or None.
+    Built from fixed phrases, so it says nothing about who the student is.
+    """
+    profile = student_data.get('profile', {})
+    phrases = []
+    try:
+        if float(profile.get('cgpa') or 4.0) < 2.0:
+            phrases.append("probation warning minimum CGPA 2.0")
+    except ValueError:
+        pass
+    if any(float(c.get('percentage', 100)) < 75 for c in student_data.get('attendance', [])):
+        phrases.append("attendance shortage minimum 75% attendance")
+    try:
+        if float(student_data.get('financials', {}).get('total_remaining_balance') or 0) > 0:
+            phrases.append("dues fee payment fine")
+    except (TypeError, ValueError):
+        pass
+    return " ".join(phrases) or None
+
+def retrieve_context(client, embedding_cache, bm25_index, reranker, user_query, student_data, top_k=5):
     """
-    Retrieves context from the persistent ChromaDB collection.
+    Retrieves context by hybrid search: the persistent ChromaDB collection for meaning and the
+    BM25 index for exact terms such as rule numbers and course codes, fused by rank. With a
+    reranker, about RERANK_CANDIDATES fused chunks are over-fetched and a cross-encoder picks the top_k.
+    Only the question is embedded, so its vector is shared through the EmbeddingCache by every
+    student who asks it. For questions about the student, their situation is a second, keyword-only query.
+    A compound question ("attendance rules and fee refund policy") is split into sub-queries that
+    are encoded in one batch and searched in one ChromaDB call; the merged context then grows
+    by two chunks per extra part, up to MULTI_QUERY_MAX_CHUNKS.
     """
     print("--- Retrieving context from persistent DB ---")
     try:
         # Ensure inputs are strings to prevent TypeErrors
         user_query = str(user_query)
-        formatted_student_summary = str(formatted_student_summary)
-        
-        augmented_query = f"Student Summary: {formatted_student_summary}\nUser's Question: {user_query}"
+        context_query = student_context_query(student_data) if PERSONAL_PATTERN.search(user_query) else None
         
         collection = client.get_collection(name=COLLECTION_NAME)
 
-        # Generate the embedding for the query
-        query_embedding = embedding_model.encode(augmented_query).tolist()
+        sub_queries = split_question(user_query)
+        if len(sub_queries) > 1:
+            top_k = max(top_k, min(MULTI_QUERY_MAX_CHUNKS, top_k + 2 * (len(sub_queries) - 2)))
+            print(f"    - Split into {len(sub_queries) - 1} sub-queries: {sub_queries[1:]}")
+
+        # Generate the embeddings for the question alone (and its parts) in one batch
+        start = time.perf_counter()
+        query_embeddings = embedding_cache.encode_many(sub_queries)
+        print(f"    - Query embedding in {(time.perf_counter() - start) * 1000:.1f}ms. "
+              f"Embedding cache: {embedding_cache.stats()}")
+        if context_query:
+            print(f"    - Student context query: '{context_query}'")
         
-        # Perform the query
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=top_k,
-            include=['documents', 'metadatas'] # Make sure to include metadatas
+        fetch_k = max(top_k, RERANK_CANDIDATES) if reranker is not None else top_k
+        results = multi_hybrid_search(
+            collection, bm25_index, sub_queries, query_embeddings,
+            top_k=fetch_k, candidates=max(fetch_k, HYBRID_CANDIDATES), rrf_k=RRF_K,
+            context_query=context_query, where=RETRIEVAL_FILTER
         )
+        if reranker is not None:
+            results = reranker.rerank(user_query, results, top_k=top_k, sub_queries=sub_queries)
         
         print(f"    - Found {len(results['documents'][0])} relevant documents.")
         return results
@@ -293,10 +596,13 @@ def retrieve_context(client, embedding_model, user_query, formatted_student_summ
         return {'documents': [[]], 'metadatas': [[]]}
     
 
-def generate_response_with_groq(user_query, student_data, formatted_student_summary, conversation_history, context_docs):
-    """Generates a personalized response using Groq with advanced prompt engineering."""
-    context_str = "\n\n".join(f"--- Handbook Excerpt ---\n{doc}" for doc in context_docs)
-    history_str = "\n".join([f"Previous {msg['role']}: {msg['content']}" for msg in conversation_history])
+def build_chat_messages(user_query, student_data, formatted_student_summary, conversation_history, context_docs):
+    """
+    Builds the system and user messages for a personalized answer with advanced prompt engineering.
+    Handbook excerpts are compacted and added in relevance order until PROMPT_TOKEN_BUDGET is used up;
+    the oldest conversation turns are dropped first when the rest of the prompt alone would exceed it.
+    """
+    history_turns = [f"Previous {msg['role']}: {msg['content']}" for msg in conversation_history]
 
     system_prompt = """
     You are "Superior University's AI Assistant", a friendly, professional, and highly knowledgeable support agent.
@@ -309,65 +615,157 @@ def generate_response_with_groq(user_query, student_data, formatted_student_summ
     **Your Core Directives:**
     1. **Synthesize ALL Information:** Use conversation history, student record summary, timetable data, and handbook excerpts.
     2. **Prioritize the New Question:** Focus on answering the user's newest question.
-    3. **Handle Tables & Data:** Parse HTML tables and JSON data accurately.
+    3. **Handle Tables & Data:** Parse markdown tables (header row, then "|"-separated rows) and JSON data accurately.
     4. **NEVER Invent Information:** If information isn't available, explicitly state this.
     5. **Structure Your Answers:** Provide direct answers with clear reasoning and markdown formatting.
     """
     
+    timetable_section = ""
+    instruction = "Provide a helpful and accurate response based on the information above."
     if any(keyword in user_query.lower() for keyword in ["timetable", "schedule", "my classes", "class schedule"]):
-        timetable_data = student_data.get('timetable', {})
-        user_prompt = f"""
-        ### Conversation History
-        {history_str}
-        
-        ### Student's Record Summary
-        {formatted_student_summary}
-
+        # Minified: indentation costs tokens and tells the model nothing
+        timetable_section = f"""
         ### Full Timetable Data
         ```json
-        {json.dumps(timetable_data, indent=2)}
+        {minify_json(student_data.get('timetable', {}))}
         ```
-        
-        ### Relevant University Handbook Excerpts
-        {context_str}
-
-        ### New User Question
-        {user_query}
-        
-        **Instruction:** Format the student's complete weekly schedule into a clean, easy-to-read markdown table.
         """
-    else:
-        user_prompt = f"""
+        instruction = "Format the student's complete weekly schedule into a clean, easy-to-read markdown table."
+
+    def user_prompt(history_str, context_str):
+        return f"""
         ### Conversation History
         {history_str}
         
         ### Student's Record Summary
         {formatted_student_summary}
-
+        {timetable_section}
         ### Relevant University Handbook Excerpts
         {context_str}
 
         ### New User Question
         {user_query}
         
-        **Instruction:** Provide a helpful and accurate response based on the information above.
+        **Instruction:** {instruction}
         """
+
+    packer = get_context_packer()
+    history_str = "\n".join(packer.fit_history([system_prompt, user_prompt("", "")], history_turns))
+    packed_docs, report = packer.pack(
+        [system_prompt, user_prompt(history_str, "")], context_docs, document_prefix=EXCERPT_HEADING
+    )
+    print(f"    - Prompt: {report['prompt_tokens']}{'~' if report['approximate'] else ''}/{report['budget']} tokens "
+          f"({report['fixed_tokens']} fixed, {report['context_tokens']} in {report['excerpts']} excerpts, "
+          f"{report['context_tokens_uncompacted']} before compaction, {report['dropped']} excerpts dropped)")
+    context_str = "\n\n".join(f"{EXCERPT_HEADING}{doc}" for doc in packed_docs)
     
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt(history_str, context_str)}
+    ]
+
+def stream_response_with_groq(messages, outcome=None):
+    """
+    Yields the answer text as Groq generates it (through the shared LLM client) and logs
+    time-to-first-token and tokens/s.
+    If the consumer stops early (e.g. the user navigated away and Streamlit stopped the
+    script), the HTTP stream is closed so the generation is cancelled. `outcome`, if
+    given, is a dict that receives 'error' when the request failed.
+    """
+    start = time.perf_counter()
+    first_token_at = None
+    chunk_count = 0
+    usage = None
+    finished = False
+    stream = None
     try:
-        groq_client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
-        chat_completion = groq_client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            model=GROQ_MODEL_NAME,
-            temperature=0,
-        )
-        return chat_completion.choices[0].message.content
+        stream = get_llm_client().stream_chat(messages, model=GROQ_MODEL_NAME, temperature=0)
+        for chunk in stream:
+            x_groq = getattr(chunk, "x_groq", None)
+            if x_groq is not None and getattr(x_groq, "usage", None) is not None:
+                usage = x_groq.usage  # Sent with the last chunk
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content
+            if text:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                chunk_count += 1
+                yield text
+        finished = True
     except Exception as e:
-        return f"❌ An error occurred while contacting the Groq API: {e}"
+        finished = True
+        if outcome is not None:
+            outcome["error"] = str(e)
+        yield f"❌ An error occurred while contacting the Groq API: {e}"
+    finally:
+        if not finished and stream is not None:
+            stream.close()
+        end = time.perf_counter()
+        tokens = usage.completion_tokens if usage is not None else chunk_count
+        if first_token_at is not None:
+            generation_seconds = max(end - first_token_at, 1e-6)
+            print(f"--- LLM stream{'' if finished else ' (cancelled)'}: TTFT {first_token_at - start:.2f}s, "
+                  f"{tokens} tokens in {generation_seconds:.2f}s ({tokens / generation_seconds:.1f} tokens/s) ---")
+        else:
+            print(f"--- LLM stream{'' if finished else ' (cancelled)'}: no tokens after {end - start:.2f}s ---")
+
+def answer_question(user_query, student_data, formatted_student_summary, conversation_history, results, embedding_cache):
+    """
+    Yields the answer to a chat message as it is generated. General handbook questions
+    (nothing about the student, not a follow-up) are answered from the handbook alone so
+    the answer can be shared: a semantically equivalent question that retrieved the same
+    chunks is served from the response cache without calling the LLM.
+    """
+    context_docs = results['documents'][0]
+    if not is_general_question(user_query):
+        yield from stream_response_with_groq(build_chat_messages(
+            user_query, student_data, formatted_student_summary, conversation_history, context_docs))
+        return
+
+    response_cache = get_response_cache()
+    student_name = student_data['profile']['student_name']
+    question_embedding = embedding_cache.encode(user_query)
+    chunk_ids = results.get('ids', [[]])[0]
+    answer = response_cache.lookup(question_embedding, chunk_ids, student_name)
+    if answer is not None:
+        yield answer
+    else:
+        # Only the name is shared with the LLM, so the answer holds nothing personal
+        messages = build_chat_messages(user_query, student_data, f"Student Name: {student_name}", [], context_docs)
+        outcome = {}
+        parts = []
+        for text in stream_response_with_groq(messages, outcome):
+            parts.append(text)
+            yield text
+        if "error" not in outcome:
+            response_cache.store(user_query, question_embedding, chunk_ids, "".join(parts), student_name)
+    print(f"    - Response cache: {response_cache.stats()}")
 
 # --- 5. MAIN APPLICATION ---
+def complete_login(student_data, parent_whatsapp_input):
+    """Stores the fetched data in the session and switches to the dashboard."""
+    # This logic to update the WhatsApp number is fine, but it will only
+    # work locally. On Streamlit Cloud, you cannot modify the .env file.
+    # It's better to manage this via Streamlit's Secrets manager UI.
+    if "STREAMLIT_SERVER_RUNNING" not in os.environ:
+        existing_whatsapp = os.getenv("PARENT_WHATSAPP_NUMBER", "")
+        if parent_whatsapp_input and parent_whatsapp_input != existing_whatsapp:
+            update_env_file("PARENT_WHATSAPP_NUMBER", parent_whatsapp_input)
+            load_dotenv(override=True)
+
+    # This is your new "caching" mechanism.
+    # We save the fetched data directly into the session state.
+    st.session_state.logged_in = True
+    st.session_state.student_data = student_data
+    st.session_state.data_version = get_scrape_cache().last_updated(student_data['roll_no'])
+    st.session_state.messages = [
+        {"role": "assistant", "content": f"Hello {student_data['profile']['student_name']}! 👋 How can I help?"}
+    ]
+
+    # Rerun the script to hide the login form and show the main dashboard.
+    st.rerun()
+
 def main():
     """Main application function."""
     st.set_page_config(
@@ -377,6 +775,10 @@ def main():
         initial_sidebar_state="expanded"
     )
     load_custom_css()
+    # Start loading the AI components on the first page view after a deploy, long before anyone logs in
+    warmup = get_warmup()
+    # Pre-start the pooled browsers too, so the first login does not wait for Firefox
+    get_driver_pool()
 
     # --- Initialize session state ---
     if "logged_in" not in st.session_state:
@@ -389,6 +791,28 @@ def main():
 
     # --- Login Screen ---
     if not st.session_state.logged_in:
+
+        # 0. If a live scrape was queued for this session, follow it until it finishes.
+        job_id = st.session_state.get("scrape_job_id")
+        job = get_scrape_scheduler().get(job_id) if job_id else None
+        if job_id and job is None:
+            del st.session_state.scrape_job_id  # The job expired or the server restarted
+        if job is not None:
+            if job.status in ACTIVE_STATUSES and 'profile' in job.partial_data:
+                # Show the dashboard as soon as the profile is in; it fills in the other sections
+                complete_login({'roll_no': job.roll_no, **job.partial_data}, st.session_state.pop("pending_whatsapp", ""))
+            if job.status in ACTIVE_STATUSES:
+                watch_login_scrape(job.id)
+                st.stop()
+
+            del st.session_state.scrape_job_id
+            if job.status == "done":
+                st.balloons()
+                st.success("🎉 Live data fetched successfully!")
+                complete_login(job.result, st.session_state.pop("pending_whatsapp", ""))
+            else:
+                # Handle errors reported by the scraper (e.g., invalid login)
+                st.error(f"❌ Failed to fetch data. Error: {job.error}")
         
         # 1. Create the login form UI.
         #    (The code to get default values from .env for the form is good practice for local dev)
@@ -401,6 +825,12 @@ def main():
             default_password=default_password,
             existing_whatsapp_number=existing_whatsapp
         )
+        if warmup.ready:
+            st.caption(f"🟢 AI assistant ready (warmed up in {warmup.timings['total']:.1f}s)")
+        elif warmup.error:
+            st.caption(f"🔴 AI assistant unavailable: {warmup.error}")
+        else:
+            st.caption("🟡 AI assistant is warming up...")
         
         # 2. Handle the form submission when the button is clicked.
         if login_button:
@@ -408,36 +838,34 @@ def main():
                 st.error("❌ Roll Number and Password are required.")
             else:
                 # --- THIS IS THE KEY CHANGE ---
-                # Call the new, single function that handles scraping without file I/O.
+                # Serves the cache instantly, or queues a background scrape and returns None.
                 student_data = login_and_fetch_data(roll_no_input, password_input)
                 # --- END OF KEY CHANGE ---
                 
-                # 3. If scraping was successful, save data to the session and proceed.
+                # 3. If data is already available, log in; otherwise poll the queued scrape.
                 if student_data:
-                    # This logic to update the WhatsApp number is fine, but it will only
-                    # work locally. On Streamlit Cloud, you cannot modify the .env file.
-                    # It's better to manage this via Streamlit's Secrets manager UI.
-                    if "STREAMLIT_SERVER_RUNNING" not in os.environ:
-                        if parent_whatsapp_input and parent_whatsapp_input != existing_whatsapp:
-                            update_env_file("PARENT_WHATSAPP_NUMBER", parent_whatsapp_input)
-                            load_dotenv(override=True)
-                
-                    # This is your new "caching" mechanism.
-                    # We save the fetched data directly into the session state.
-                    st.session_state.logged_in = True
-                    st.session_state.student_data = student_data
-                    st.session_state.messages = [
-                        {"role": "assistant", "content": f"Hello {student_data['profile']['student_name']}! 👋 How can I help?"}
-                    ]
-                    
-                    # Rerun the script to hide the login form and show the main dashboard.
+                    complete_login(student_data, parent_whatsapp_input)
+                else:
+                    st.session_state.pending_whatsapp = parent_whatsapp_input
                     st.rerun()
 
     
     # --- Main Dashboard (Logged-in State) ---
     else:
+        # Sections this session's scrape has finished since the last rerun
+        loading_sections = follow_scrape_job()
+
+        # Pick up sections that a background refresh has written to the cache since the last rerun
+        scrape_cache = get_scrape_cache()
+        roll_no = st.session_state.student_data.get('roll_no')
+        if scrape_cache.last_updated(roll_no) > st.session_state.get('data_version', 0):
+            refreshed_data, _ = scrape_cache.load(roll_no)
+            if refreshed_data:
+                st.session_state.student_data = refreshed_data
+                st.session_state.data_version = scrape_cache.last_updated(roll_no)
+
         student_data = st.session_state.student_data
-        chroma_client, embedding_model = initialize_components()
+        chroma_client, embedding_cache, bm25_index, reranker = initialize_components()
         formatted_summary = format_student_data_for_prompt(student_data)
 
         # --- Sidebar ---
@@ -492,6 +920,8 @@ def main():
 
         # --- Main Header ---
         create_welcome_header(student_name=student_data['profile']['student_name'])
+        if loading_sections:
+            show_loading_notice(loading_sections)
 
       # In your app.py, inside the 'else:' block for the logged-in state
 
@@ -501,7 +931,8 @@ def main():
         cgpa = student_data.get('profile', {}).get('cgpa', 'N/A')
         semester = student_data.get('profile', {}).get('semester', 'N/A')
         standing = student_data.get('profile', {}).get('academic_standing', 'N/A')
-        balance = student_data.get('financials', {}).get('total_remaining_balance', 'N/A')
+        balance = student_data.get('financials', {}).get('total_remaining_balance',
+                                                         '⏳' if 'financials' in loading_sections else 'N/A')
         # Use Streamlit's built-in columns for layout. This is the most reliable way.
         col1, col2, col3, col4 = st.columns(4)
 
@@ -568,29 +999,35 @@ def main():
                         # USE HYBRID SEARCH from Block 2's logic
                         results = retrieve_context(
                             chroma_client, 
-                            embedding_model, 
+                            embedding_cache, 
+                            bm25_index,
+                            reranker,
                             prompt, 
-                            formatted_summary
+                            student_data
                         )
                         
-                        # Generate the response
-                        response = generate_response_with_groq(
+                    # Stream the response as it is generated (general questions may come from the response cache)
+                    st.session_state.answer_in_progress = True
+                    try:
+                        response = st.write_stream(answer_question(
                             prompt, 
                             student_data, 
                             formatted_summary, 
                             st.session_state.messages[-3:-1], # Simple history
-                            results['documents'][0]
-                        )
-                        st.markdown(response)
+                            results,
+                            embedding_cache
+                        ))
+                    finally:
+                        st.session_state.answer_in_progress = False
                         
-                        # USE SOURCE DISPLAY from Block 1's logic
-                        with st.expander("🔍 View Retrieved Sources"):
-                            if results['documents'][0]:
-                                for i, doc in enumerate(results['documents'][0]):
-                                    # Assumes metadata might not be present in hybrid search result
-                                    st.info(f"**Source {i+1}:**\n{doc}")
-                            else:
-                                st.write("No relevant documents were retrieved from the handbook.")
+                    # USE SOURCE DISPLAY from Block 1's logic
+                    with st.expander("🔍 View Retrieved Sources"):
+                        if results['documents'][0]:
+                            for i, doc in enumerate(results['documents'][0]):
+                                # Assumes metadata might not be present in hybrid search result
+                                st.info(f"**Source {i+1}:**\n{doc}")
+                        else:
+                            st.write("No relevant documents were retrieved from the handbook.")
                 
                 st.session_state.messages.append({"role": "assistant", "content": response})
                         
@@ -605,6 +1042,10 @@ def main():
         with tab2:
             st.header("📊 Academic Analytics")
             st.markdown("An overview of your academic performance and attendance records.")
+            analytics_loading = [s for s in ('semester_results', 'attendance')
+                                 if s in loading_sections and not student_data.get(s)]
+            if analytics_loading:
+                show_loading_notice(analytics_loading)
 
             # --- GPA/CGPA TREND CHART ---
             if student_data.get('semester_results'):
@@ -650,7 +1091,9 @@ def main():
             # Safely get the list of enrolled courses from the student data
             enrolled_courses = student_data.get('enrolled_courses', [])
             
-            if not enrolled_courses:
+            if not enrolled_courses and 'enrolled_courses' in loading_sections:
+                show_loading_notice(['enrolled_courses'])
+            elif not enrolled_courses:
                 st.warning("No enrolled course data found. The scraper may need to be updated or the data is not on the portal.")
             else:
                 # --- Separate the courses into two lists based on their status ---
@@ -719,6 +1162,8 @@ def main():
                         st.markdown(f"### {day}")
                         st.info(f"No classes scheduled for {day}")
                         st.markdown("---")
+            elif 'timetable' in loading_sections:
+                show_loading_notice(['timetable'])
             else:
                 st.warning("No timetable data available.")
 
@@ -730,5 +1175,9 @@ def main():
         </div>
         """, unsafe_allow_html=True)
 
+        # Keep polling until the background scrape has delivered every section
+        if loading_sections:
+            watch_background_scrape(loading_sections)
+
 if __name__ == "__main__":
     main()
@@ -1,27 +1,46 @@
 # Import the manager for Firefox
 import os
 import re
+import time
+import hashlib
+import queue
+import threading
+from contextlib import ExitStack
+from functools import lru_cache
+from urllib.parse import urlparse, quote
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium import webdriver
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
+from utils.http_backend import ErpHttpSession, locator_to_xpath
+from utils.adaptive_wait import ContentMissing, default_waiter
 # ==============================================================================
 # --- URLS & LOCATORS: Final verified and robust locators ---
 # ==============================================================================
-URLS = {
-    "login": "https://erp.superior.edu.pk/web/login",
-    "dashboard": "https://erp.superior.edu.pk/students/dashboard",
-    "attendance": "https://erp.superior.edu.pk/student/attendance",
-    "results": "https://erp.superior.edu.pk/student/results",
-    "invoices": "https://erp.superior.edu.pk/student/invoices",
-    "timetable": "https://erp.superior.edu.pk/student/class/schedule"
+# Set ERP_BASE_URL to point the scraper at another host, e.g. the local replay
+# server in benchmarks/replay_server.py.
+ERP_BASE_URL = os.getenv("ERP_BASE_URL", "https://erp.superior.edu.pk").rstrip("/")
+
+URL_PATHS = {
+    "login": "/web/login",
+    "dashboard": "/students/dashboard",
+    "attendance": "/student/attendance",
+    "results": "/student/results",
+    "invoices": "/student/invoices",
+    "timetable": "/student/class/schedule"
 }
 
+URLS = {page: ERP_BASE_URL + path for page, path in URL_PATHS.items()}
+
 LOCATORS = {
+    "common": {
+        # Messages the portal shows instead of a table or list when there is nothing to list.
+        # Searched for inside a section's "empty_scope" container only.
+        "empty_state": ("xpath", ".//*[contains(text(), 'No record') or contains(text(), 'No Record') or contains(text(), 'No data') or contains(text(), 'No Data')]")
+    },
     "login": {
         "roll_no_field": ("id", "login"),
         "password_field": ("id", "password"),
@@ -45,6 +64,7 @@ LOCATORS = {
         "today_classes_box": ("xpath", "//div[contains(text(), 'Today Classes:')]")
     },
     "attendance_summary": {
+        "empty_scope": ("id", "page_content_inner"),
         "subject_cards_container": ("id", "hierarchical-show"),
         "subject_cards": ("xpath", ".//div[@class='md-card md-card-hover']")
     },
@@ -57,52 +77,357 @@ LOCATORS = {
     "results_summary": {
         "page_header": ("xpath", "//h3[contains(text(), 'Results')]"),
         "previous_courses_tab": ("xpath", "//a[normalize-space()='Previous Courses']"),
-        "term_summary_rows": ("xpath", "//tr[contains(@class, 'table-parent-row')]")
+        "term_summary_rows": ("xpath", "//tr[contains(@class, 'table-parent-row')]"),
+        "all_rows": ("xpath", "//table[contains(@class, 'table_tree')]/tbody/tr"),
+        "empty_scope": ("xpath", "//table[contains(@class, 'table_tree')]")
     },
     "invoices_page": {
         "page_header": ("xpath", "//h3[contains(text(), 'Invoices List')]"),
-        "table_rows": ("xpath", "//table[contains(@class, 'table_check')]/tbody/tr")
+        "table_rows": ("xpath", "//table[contains(@class, 'table_check')]/tbody/tr"),
+        "empty_scope": ("xpath", "//table[contains(@class, 'table_check')]")
     },
     "timetable_page": {
         "header": ("xpath", "//h3[contains(text(), 'Class Schedule')]"),
-        "day_groups": ("xpath", "//li[@class='cd-schedule__group']")
+        "day_groups": ("xpath", "//li[@class='cd-schedule__group']"),
+        "events": ("xpath", "//li[@class='cd-schedule__event']"),
+        "empty_scope": ("xpath", "//div[contains(@class, 'cd-schedule')]")
     }
 }
 
+# Sections that can be fingerprinted before the full per-row parse: the number of
+# nodes matched by the first locator plus the text of the nodes matched by the second.
+FINGERPRINT_LOCATORS = {
+    "semester_results": ("results_summary.all_rows", "results_summary.term_summary_rows"),
+    "timetable": ("timetable_page.events", "timetable_page.day_groups"),
+}
+
+# Runs in the browser and returns the raw fingerprint text in a single round-trip.
+FINGERPRINT_SCRIPT = """
+const snapshot = (xpath) => document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const counted = snapshot(arguments[0]);
+const summary = snapshot(arguments[1]);
+const parts = [String(counted.snapshotLength)];
+for (let i = 0; i < summary.snapshotLength; i++) {
+    parts.push(summary.snapshotItem(i).textContent.replace(/\\s+/g, ' ').trim());
+}
+return parts.join('\\n');
+"""
+
+# --- Bulk extraction: each script reads a whole table or list in one round-trip ---
+# innerText of the first node matching each XPath in arguments[0] (null when absent).
+XPATH_TEXTS_SCRIPT = """
+const first = (xpath) => document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+return arguments[0].map((xpath) => { const node = first(xpath); return node ? node.innerText : null; });
+"""
+
+# [class, [cell texts]] for every row matching arguments[0]. Hidden cells have an
+# empty innerText, so their textContent is used instead (like the per-element path).
+TABLE_ROWS_SCRIPT = """
+const rows = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const result = [];
+for (let i = 0; i < rows.snapshotLength; i++) {
+    const row = rows.snapshotItem(i);
+    const cells = Array.from(row.querySelectorAll(':scope > td'), (td) => td.innerText || td.textContent);
+    result.push([row.getAttribute('class') || '', cells]);
+}
+return result;
+"""
+
+# href of the first link in every card matching arguments[1] inside the container arguments[0].
+CARD_LINKS_SCRIPT = """
+const container = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!container) return [];
+const cards = document.evaluate(arguments[1], container, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const links = [];
+for (let i = 0; i < cards.snapshotLength; i++) {
+    const anchor = cards.snapshotItem(i).querySelector('a');
+    if (anchor) links.push(anchor.href);
+}
+return links;
+"""
+
+# [day, [[event text, data-start, data-end], ...]] for every day group matching arguments[0].
+TIMETABLE_SCRIPT = """
+const groups = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const days = [];
+for (let i = 0; i < groups.snapshotLength; i++) {
+    const group = groups.snapshotItem(i);
+    const day = group.querySelector('div.cd-schedule__top-info > span');
+    const events = Array.from(group.querySelectorAll('li.cd-schedule__event'), (event) => {
+        const anchor = event.querySelector('a');
+        return anchor ? [anchor.innerText, anchor.getAttribute('data-start'), anchor.getAttribute('data-end')] : null;
+    }).filter((event) => event !== null);
+    days.push([day ? day.innerText : '', events]);
+}
+return days;
+"""
+
+# textContent of every node matching the CSS selector arguments[0].
+NODE_TEXTS_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0]), (node) => node.textContent);
+"""
+
+# Prefix of fingerprints that are an HTTP ETag/Last-Modified value rather than a hash
+VALIDATOR_PREFIX = "validator:"
+
+# Each key of erp_data and the scraper method that fills it, in sequential order.
+SECTION_SCRAPERS = {
+    "profile": "_scrape_dashboard",
+    "attendance": "_scrape_attendance",
+    "semester_results": "_scrape_results",
+    "financials": "_scrape_invoices",
+    "timetable": "_scrape_timetable",
+    "enrolled_courses": "_scrape_enrolled_courses",
+}
+
+# Sections the HTTP backend can read from server-rendered HTML. Anything not
+# listed here, or any page that turns out to need JavaScript, uses Selenium.
+HTTP_SECTION_SCRAPERS = {
+    "attendance": "_scrape_attendance_http",
+    "semester_results": "_scrape_results_http",
+    "financials": "_scrape_invoices_http",
+    "timetable": "_scrape_timetable_http",
+}
+
+SCRAPE_BACKENDS = ("selenium", "http")
+
+# Number of logged-in browsers used by the parallel mode (including the main one).
+PARALLEL_WORKERS = 3
+
+# Maximum number of attendance detail pages fetched at the same time.
+ATTENDANCE_FETCH_WORKERS = 8
+
+# Firefox preferences for scraping: the ERP pages are only read as text, so images,
+# media and web fonts are not downloaded and background features are switched off.
+# Stylesheets stay enabled because the visibility waits and .text depend on them.
+LEAN_FIREFOX_PREFS = {
+    # Content that is never read
+    "permissions.default.image": 2,
+    "gfx.downloadable_fonts.enabled": False,
+    "media.autoplay.default": 5,
+    "media.autoplay.blocking_policy": 2,
+    "media.navigator.enabled": False,
+    "media.peerconnection.enabled": False,
+    # Speculative and background network traffic
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "browser.safebrowsing.downloads.enabled": False,
+    "extensions.update.enabled": False,
+    "app.update.auto": False,
+    "toolkit.telemetry.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    # Features a scraper does not need
+    "dom.webnotifications.enabled": False,
+    "dom.push.enabled": False,
+    "geo.enabled": False,
+    "accessibility.force_disabled": 1,
+    "browser.sessionhistory.max_entries": 2,
+    "browser.sessionstore.resume_from_crash": False,
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.homepage_override.mstone": "ignore",
+    # Fewer content processes keep the memory per browser down
+    "dom.ipc.processCount": 1,
+    "fission.autostart": False,
+}
+
+# Set ERP_BLOCK_THIRD_PARTY=true to refuse every request that is not for the ERP host
+# (analytics, CDNs). Off by default because a page could rely on a third-party script.
+BLOCK_THIRD_PARTY_HOSTS = os.getenv("ERP_BLOCK_THIRD_PARTY", "false").lower() == "true"
+
+# Requests the PAC file refuses are sent to this closed local port and fail at once.
+BLOCKED_PROXY = "PROXY 127.0.0.1:9"
+
+# Cookie fields accepted by WebDriver's add_cookie.
+COOKIE_FIELDS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry")
+
+
+@lru_cache(maxsize=1)
+def _geckodriver_path():
+    # webdriver-manager automatically downloads and manages the correct geckodriver.
+    # Resolving it once per process avoids a version lookup for every new browser.
+    return GeckoDriverManager().install()
+
+
+def third_party_block_pac(allowed_hosts):
+    """A data: URL proxy auto-config script that only lets requests for `allowed_hosts` through."""
+    script = (
+        "function FindProxyForURL(url, host) {"
+        f" var allowed = {sorted(set(allowed_hosts))!r};"
+        " for (var i = 0; i < allowed.length; i++) {"
+        "  if (host === allowed[i] || dnsDomainIs(host, '.' + allowed[i])) return 'DIRECT';"
+        " }"
+        f" return '{BLOCKED_PROXY}';"
+        "}"
+    )
+    return "data:text/javascript," + quote(script)
+
+
+def create_firefox_driver(lean=True, block_third_party=None):
+    """
+    Starts a headless Firefox instance configured for the current environment.
+    `lean` applies LEAN_FIREFOX_PREFS; `block_third_party` (default BLOCK_THIRD_PARTY_HOSTS)
+    also refuses every host other than the ERP portal.
+    """
+    # This code will now work on BOTH your local machine and Streamlit Cloud
+    print("--- Initializing new Selenium Firefox Driver instance ---")
+    options = FirefoxOptions()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+
+    if lean:
+        for name, value in LEAN_FIREFOX_PREFS.items():
+            options.set_preference(name, value)
+    if BLOCK_THIRD_PARTY_HOSTS if block_third_party is None else block_third_party:
+        allowed_hosts = {urlparse(url).hostname for url in URLS.values()}
+        options.set_preference("network.proxy.type", 2)
+        options.set_preference("network.proxy.autoconfig_url", third_party_block_pac(allowed_hosts))
+        print(f"--- Blocking third-party hosts (allowed: {', '.join(sorted(allowed_hosts))}) ---")
+
+    # --- This is the environment-aware logic ---
+    # Check if the app is running on Streamlit's servers
+    if "STREAMLIT_SERVER_RUNNING" in os.environ:
+        # If on Streamlit Cloud, it's a Linux environment
+        print("--- Running in Streamlit Cloud environment ---")
+        # We explicitly point to the Firefox binary installed via packages.txt
+        options.binary_location = '/usr/bin/firefox-esr'
+    else:
+        # If running locally, you don't need to set the binary_location
+        print("--- Running in local environment ---")
+
+    service = FirefoxService(_geckodriver_path())
+    driver = webdriver.Firefox(service=service, options=options)
+    print("--- Driver instance created successfully ---")
+    return driver
+
+
+def parse_timetable_event(event_text, start, end):
+    """Turns the multi-line text of a timetable event into a time/details/venue dict."""
+    # 1. Get the raw text, replacing newlines with a clear delimiter
+    full_details_string = event_text.replace('\n', ' | ')
+
+    # 2. Prepare default values
+    course_name = full_details_string  # Default to the full string
+    venue = "N/A"
+
+    # 3. Parse the string
+    try:
+        parts = [p.strip() for p in full_details_string.split('|')]
+
+        if len(parts) > 0:
+            course_name = parts[0]  # The first part is the course name
+
+        if len(parts) > 2:
+            venue = parts[2]  # The third part is the venue
+
+    except Exception as e:
+        print(f"    - Could not parse event string: '{full_details_string}'. Error: {e}")
+
+    return {
+        "time": f"{start} - {end}",
+        "details": course_name, # The cleaned course name
+        "venue": venue          # The extracted venue
+    }
+
+
+def build_semester_results(rows):
+    """
+    Groups the rows of the results 'table_tree' into semesters.
+    `rows` is a list of (row_class, [cell texts]) tuples in table order.
+    """
+    all_results = []
+    current_semester_data = None
+
+    for row_class, cols in rows:
+        if "table-parent-row" in row_class:
+            if len(cols) >= 6:
+                current_semester_data = {
+                    "term": cols[0].strip(),
+                    "gpa": cols[4].strip(),
+                    "cgpa": cols[5].strip(),
+                    "courses": []
+                }
+                all_results.append(current_semester_data)
+
+        elif "table-child-row" in row_class and current_semester_data:
+            if len(cols) == 4:
+                current_semester_data["courses"].append({
+                    "course_name": cols[0].strip(),
+                    "credits": cols[1].strip(),
+                    "marks_obtained": cols[2].strip(),
+                    "final_grade": cols[3].strip()
+                })
+
+    return all_results
+
+
+def total_invoice_balance(balance_texts):
+    """Sums the 'balance' column of the invoices table, ignoring non-numeric cells."""
+    total_balance = 0.0
+    for text in balance_texts:
+        try:
+            total_balance += float(text.strip())
+        except ValueError:
+            continue
+    return total_balance
+
 # ==============================================================================
 #                          UPDATED SCRAPER CLASS
 # ==============================================================================
 class EnhancedErpScraper:
-    def __init__(self, roll_no, password):
-        # This code will now work on BOTH your local machine and Streamlit Cloud
-        print("--- Initializing new Selenium Firefox Driver instance ---")
-        options = FirefoxOptions()
-        options.add_argument("--headless")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920,1080")
-
-        # --- This is the environment-aware logic ---
-        # Check if the app is running on Streamlit's servers
-        if "STREAMLIT_SERVER_RUNNING" in os.environ:
-            # If on Streamlit Cloud, it's a Linux environment
-            print("--- Running in Streamlit Cloud environment ---")
-            # We explicitly point to the Firefox binary installed via packages.txt
-            options.binary_location = '/usr/bin/firefox-esr'
-        else:
-            # If running locally, you don't need to set the binary_location
-            print("--- Running in local environment ---")
+    def __init__(self, roll_no, password, driver=None, backend="selenium", waiter=None, bulk_extraction=True,
+                 session_store=None, driver_pool=None):
+        if backend not in SCRAPE_BACKENDS:
+            raise ValueError(f"Unknown scrape backend '{backend}'. Use one of {SCRAPE_BACKENDS}.")
+
+        # A caller may hand in an already running driver (e.g. a parallel worker);
+        # in that case the caller is responsible for quitting it.
+        self._owns_driver = driver is None
+        self.driver = driver if driver is not None else create_firefox_driver()
+        # Optional DriverPool that parallel workers borrow their browsers from
+        self.driver_pool = driver_pool
+
+        # With backend="http", pages are fetched through a requests.Session that
+        # reuses the browser's login cookies; it is created right after _login.
+        self.backend = backend
+        self.http = None
+        # Which backend actually produced each section
+        self.section_backends = {}
+
+        # Incremental mode: fingerprints and data from the previous scrape, if any
+        self.previous_snapshot = {"fingerprints": {}, "data": {}}
+        self.fingerprints = {}
+        self.skipped_sections = []
+        # Sections whose scrape raised an error in the last run; their data must not be cached
+        self.failed_sections = set()
+
+        # Optional callback(section, data) invoked as each section finishes
+        self.on_section = None
+
+        # Learns typical load times per page and fails fast on empty or broken pages
+        self.waiter = waiter or default_waiter
+
+        # Read each table or list with one execute_script call instead of one
+        # WebDriver command per row and cell. False keeps the per-element path.
+        self.bulk_extraction = bulk_extraction
+
+        # Optional SessionStore: a still-valid saved ERP session replaces the login form
+        self.session_store = session_store
+        self.reused_session = False
 
-        # webdriver-manager automatically downloads and manages the correct geckodriver
-        # This replaces your hardcoded "geckodriver.exe"
-        service = FirefoxService(GeckoDriverManager().install())
-        
-        self.driver = webdriver.Firefox(service=service, options=options)
-        
-        # The rest of your __init__ method
         self.roll_no = roll_no
         self.password = password
         self.erp_data = {'roll_no': roll_no}
-        print("--- Driver instance created successfully ---")
+        # Seconds spent in each step of the last scrape_all_data() call
+        self.timings = {}
+        # Per-page timings for sections that load several pages, e.g. attendance details
+        self.page_timings = {}
+        # Guards the merges into the fields above while sections run in parallel
+        self._merge_lock = threading.Lock()
 
     def _get_locator(self, key_path):
         keys = key_path.split('.')
@@ -110,8 +435,82 @@ class EnhancedErpScraper:
         for key in keys: value = value[key]
         return (getattr(By, value[0].upper()), value[1])
 
+    def _get_xpath(self, key_path):
+        keys = key_path.split('.')
+        value = LOCATORS
+        for key in keys: value = value[key]
+        return locator_to_xpath(value)
+
+    def _wait(self, page_key, key_path, condition="presence", default_timeout=10, empty_scope=None, **wait_options):
+        """
+        Waits for a LOCATORS element using the adaptive waiter. With an `empty_scope` key the
+        wait stops as soon as that container shows a "no records" message (ContentMissing).
+        `wait_options` (e.g. fast_fail) are passed on to AdaptiveWaiter.wait.
+        """
+        empty_locator = None
+        if empty_scope:
+            empty_locator = (self._get_locator(empty_scope), self._get_locator("common.empty_state"))
+        return self.waiter.wait(self.driver, page_key, self._get_locator(key_path), condition=condition,
+                                empty_locator=empty_locator, default_timeout=default_timeout, **wait_options)
+
+    def _handle_missing_section(self, section, empty_value, error):
+        """Stores an empty section for an explicit "no records" page, otherwise just reports it."""
+        if error.empty_state:
+            self.erp_data[section] = empty_value
+            print(f"    - No {section.replace('_', ' ')} records on the portal.")
+        else:
+            self.failed_sections.add(section)
+            print(f"    - ⚠️ {error}")
+
+    def _read_texts(self, *key_paths):
+        """Visible text of the first element for each LOCATORS key, or None for any that is missing."""
+        if self.bulk_extraction:
+            texts = self.driver.execute_script(XPATH_TEXTS_SCRIPT, [self._get_xpath(k) for k in key_paths])
+            return [text.strip() if text is not None else None for text in texts]
+        texts = []
+        for key_path in key_paths:
+            try:
+                texts.append(self.driver.find_element(*self._get_locator(key_path)).text.strip())
+            except NoSuchElementException:
+                texts.append(None)
+        return texts
+
+    def _read_table_rows(self, key_path):
+        """(class, [cell texts]) for every table row matched by a LOCATORS key."""
+        if self.bulk_extraction:
+            return [(row_class, cells) for row_class, cells in
+                    self.driver.execute_script(TABLE_ROWS_SCRIPT, self._get_xpath(key_path))]
+        rows = []
+        for row in self.driver.find_elements(*self._get_locator(key_path)):
+            row_class = row.get_attribute("class") or ""
+            cols = row.find_elements(By.TAG_NAME, 'td')
+            if "table-child-row" in row_class:
+                # --- FIX: Use .get_attribute('textContent') for hidden elements ---
+                rows.append((row_class, [col.get_attribute('textContent') for col in cols]))
+            else:
+                rows.append((row_class, [col.text for col in cols]))
+        return rows
+
+    def _read_timetable_days(self):
+        """(day, [(event text, start, end), ...]) for every day group on the timetable page."""
+        if self.bulk_extraction:
+            days = self.driver.execute_script(TIMETABLE_SCRIPT, self._get_xpath("timetable_page.day_groups"))
+            return [(day.strip(), events) for day, events in days]
+        days = []
+        for group in self.driver.find_elements(*self._get_locator("timetable_page.day_groups")):
+            day = group.find_element(By.XPATH, ".//div[@class='cd-schedule__top-info']/span").text
+            events = []
+            for event in group.find_elements(By.XPATH, ".//li[@class='cd-schedule__event']"):
+                anchor = event.find_element(By.TAG_NAME, 'a')
+                events.append((anchor.text, anchor.get_attribute('data-start'), anchor.get_attribute('data-end')))
+            days.append((day, events))
+        return days
+
     def __enter__(self): return self
-    def __exit__(self, exc_type, exc_val, exc_tb): print("\n--- Browser Closed ---"); self.driver.quit()
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._owns_driver:
+            print("\n--- Browser Closed ---")
+            self.driver.quit()
 
 
     def _login(self):
@@ -119,19 +518,17 @@ class EnhancedErpScraper:
         self.driver.get(URLS["login"])
         
         # Fill in login form
-        WebDriverWait(self.driver, 20).until(EC.presence_of_element_located(self._get_locator("login.roll_no_field"))).send_keys(self.roll_no)
+        self._wait("login", "login.roll_no_field", default_timeout=20).send_keys(self.roll_no)
         self.driver.find_element(*self._get_locator("login.password_field")).send_keys(self.password)
         self.driver.find_element(*self._get_locator("login.login_button")).click()
         
         # --- START: ROBUST LOGIN CHECK ---
         try:
             # After clicking login, wait for the student name to prove we are on the dashboard
-            WebDriverWait(self.driver, 20).until(
-                EC.visibility_of_element_located(self._get_locator("dashboard.student_name"))
-            )
+            self._wait("login_result", "dashboard.student_name", condition="visible", default_timeout=20)
             print("    - ✅ Login Successful!")
             
-        except TimeoutException:
+        except (TimeoutException, ContentMissing):
             # If the student name doesn't appear, login has failed.
             error_message = "Login Failed: An unknown error occurred."
             
@@ -160,6 +557,41 @@ class EnhancedErpScraper:
             # Raise a clean exception that the main app can catch and display
             raise Exception(error_message)
 
+    def _restore_session(self):
+        """
+        Loads the saved session cookies into the browser and checks that they are still
+        logged in. Returns False (and forgets the session) when they are not.
+        """
+        if self.session_store is None:
+            return False
+        cookies = self.session_store.load(self.roll_no, self.password)
+        if not cookies:
+            return False
+
+        print("--- 1. Restoring Saved ERP Session ---")
+        # Cookies can only be added for the domain of the page that is open
+        self.driver.get(URLS["login"])
+        try:
+            for cookie in cookies:
+                self.driver.add_cookie({k: cookie[k] for k in COOKIE_FIELDS if k in cookie})
+            self.driver.get(URLS["dashboard"])
+            self._wait("session_check", "dashboard.student_name", condition="visible")
+        except (WebDriverException, ContentMissing):
+            print("    - Saved session has expired, logging in again.")
+            self.session_store.forget(self.roll_no)
+            self.driver.delete_all_cookies()
+            return False
+        print("    - ✅ Reused saved session, skipped the login form.")
+        return True
+
+    def _save_session(self):
+        if self.session_store is None:
+            return
+        try:
+            self.session_store.save(self.roll_no, self.password, self.driver.get_cookies())
+        except Exception as e:
+            print(f"    - ⚠️ Could not save the ERP session: {e}")
+
     def _scrape_dashboard(self):
         print("--- 2. Scraping Dashboard ---")
         try:
@@ -167,14 +599,14 @@ class EnhancedErpScraper:
             profile_data = {}
 
             # Wait for the student name to ensure the page's JS has loaded
-            name_element = WebDriverWait(self.driver, 20).until(
-                EC.visibility_of_element_located(self._get_locator("dashboard.student_name"))
-            )
+            name_element = self._wait("dashboard", "dashboard.student_name", condition="visible", default_timeout=20)
             profile_data['student_name'] = name_element.text
             
-            # --- ACADEMIC INFO: Find and safely parse ---
-            try:
-                academic_text = self.driver.find_element(*self._get_locator("dashboard.academic_info_box")).text
+            academic_text, credits_text, classes_text = self._read_texts(
+                "dashboard.academic_info_box", "dashboard.credits_info_box", "dashboard.today_classes_box")
+
+            # --- ACADEMIC INFO: Safely parse ---
+            if academic_text is not None:
                 standing_match = re.search(r"Academic standings:\s*(\w+)", academic_text)
                 profile_data['academic_standing'] = standing_match.group(1) if standing_match else "Not Found"
                 
@@ -183,27 +615,25 @@ class EnhancedErpScraper:
 
                 cgpa_match = re.search(r"CGPA:\s*([\d.]+)", academic_text)
                 profile_data['cgpa'] = cgpa_match.group(1) if cgpa_match else "Not Found"
-            except NoSuchElementException:
+            else:
                 print("    - Could not find academic info box.")
                 profile_data.update({'academic_standing': 'Not Found', 'semester': 'Not Found', 'cgpa': 'Not Found'})
 
-            # --- CREDITS INFO: Find and safely parse ---
-            try:
-                credits_text = self.driver.find_element(*self._get_locator("dashboard.credits_info_box")).text
+            # --- CREDITS INFO: Safely parse ---
+            if credits_text is not None:
                 completed_match = re.search(r"Completed Cr\. / Total Cr:\s*([\d.]+)", credits_text)
                 profile_data['completed_credits'] = completed_match.group(1) if completed_match else "Not Found"
                 
                 inprogress_match = re.search(r"Inprogress Cr :\s*([\d.]+)", credits_text)
                 profile_data['inprogress_credits'] = inprogress_match.group(1) if inprogress_match else "Not Found"
-            except NoSuchElementException:
+            else:
                 print("    - Could not find credits info box.")
                 profile_data.update({'completed_credits': 'Not Found', 'inprogress_credits': 'Not Found'})
 
-            # --- TODAY'S CLASSES: Find and safely parse ---
-            try:
-                classes_text = self.driver.find_element(*self._get_locator("dashboard.today_classes_box")).text
+            # --- TODAY'S CLASSES: Safely parse ---
+            if classes_text is not None:
                 profile_data['today_classes'] = classes_text.split(":")[-1].strip()
-            except NoSuchElementException:
+            else:
                 print("    - Could not find today's classes box.")
                 profile_data['today_classes'] = 'Not Found'
 
@@ -211,6 +641,7 @@ class EnhancedErpScraper:
             print("    - Dashboard scraped successfully.")
         except Exception as e:
             print(f"    - ⚠️ An unexpected error occurred while scraping dashboard: {e}")
+            self.failed_sections.add('profile')
             if 'profile' not in self.erp_data:
                 self.erp_data['profile'] = {'student_name': 'Unknown_Student_ERROR'}
 
@@ -219,79 +650,182 @@ class EnhancedErpScraper:
         try:
             self.driver.get(URLS["attendance"])
             # Wait for the container of the cards, which is more reliable
-            cards_container = WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(self._get_locator("attendance_summary.subject_cards_container")))
-            subject_cards = cards_container.find_elements(*self._get_locator("attendance_summary.subject_cards"))
-            subject_urls = [card.find_element(By.TAG_NAME, 'a').get_attribute('href') for card in subject_cards]
+            cards_container = self._wait("attendance", "attendance_summary.subject_cards_container",
+                                         empty_scope="attendance_summary.empty_scope")
+            if self.bulk_extraction:
+                subject_urls = self.driver.execute_script(
+                    CARD_LINKS_SCRIPT, self._get_xpath("attendance_summary.subject_cards_container"),
+                    LOCATORS["attendance_summary"]["subject_cards"][1])
+            else:
+                subject_cards = cards_container.find_elements(*self._get_locator("attendance_summary.subject_cards"))
+                subject_urls = [card.find_element(By.TAG_NAME, 'a').get_attribute('href') for card in subject_cards]
             
-            records = []
-            for url in subject_urls:
-                self.driver.get(url)
-                # Wait for the actual data to appear, not just the page header
-                WebDriverWait(self.driver, 10).until(EC.visibility_of_element_located(self._get_locator("attendance_detail.course_name")))
-                details = {
-                    "course_name": self.driver.find_element(*self._get_locator("attendance_detail.course_name")).text.strip(),
-                    "conducted": self.driver.find_element(*self._get_locator("attendance_detail.conducted_classes")).text.strip(),
-                    "attended": self.driver.find_element(*self._get_locator("attendance_detail.attended_classes")).text.strip(),
-                    "percentage": self.driver.find_element(*self._get_locator("attendance_detail.percentage")).text.strip()
-                }
-                records.append(details)
+            records = self._fetch_attendance_details_in_tabs(subject_urls)
             self.erp_data['attendance'] = records
             print(f"    - Scraped attendance for {len(records)} courses.")
+        except ContentMissing as e:
+            self._handle_missing_section('attendance', [], e)
         except Exception as e:
             print(f"    - ⚠️ Error scraping attendance: {e}")
+            self.failed_sections.add('attendance')
+
+    def _fetch_attendance_details_in_tabs(self, subject_urls):
+        """
+        Opens every course detail page in its own tab so the browser loads them
+        at the same time, then reads the tabs one by one. Each page's time runs from
+        the moment its own tab was opened until the page had been read.
+        A page whose tab could not be opened (e.g. a blocked popup) is loaded in
+        the main tab instead, as the sequential scraper did.
+        If any page cannot be read, 'attendance' is added to failed_sections so the
+        partial list does not replace the last complete one in the cache.
+        """
+        main_handle = self.driver.current_window_handle
+        tabs = []
+        try:
+            for url in subject_urls:
+                known_handles = set(self.driver.window_handles)
+                opened_at = time.perf_counter()
+                self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+                new_handles = [h for h in self.driver.window_handles if h not in known_handles]
+                if new_handles:
+                    tabs.append((url, new_handles[0], opened_at))
+                else:
+                    print(f"    - ⚠️ Could not open a tab for {url}, loading it in the main tab.")
+                    tabs.append((url, None, None))
+
+            records = []
+            page_timings = []
+            for url, handle, opened_at in tabs:
+                self.driver.switch_to.window(handle or main_handle)
+                try:
+                    if handle is None:
+                        opened_at = time.perf_counter()
+                        self.driver.get(url)
+                    # Wait for the actual data to appear, not just the page header
+                    self._wait("attendance_detail", "attendance_detail.course_name", condition="visible")
+                    course_name, conducted, attended, percentage = self._read_texts(
+                        "attendance_detail.course_name", "attendance_detail.conducted_classes",
+                        "attendance_detail.attended_classes", "attendance_detail.percentage")
+                    if None in (conducted, attended, percentage):
+                        raise NoSuchElementException("The attendance figures are missing from the page.")
+                    details = {
+                        "course_name": course_name,
+                        "conducted": conducted,
+                        "attended": attended,
+                        "percentage": percentage
+                    }
+                    records.append(details)
+                    page_timings.append((details["course_name"], time.perf_counter() - opened_at))
+                except Exception as e:
+                    print(f"    - ⚠️ Could not read attendance page {url}: {e}")
+                    page_timings.append((url, time.perf_counter() - opened_at))
+                    self.failed_sections.add('attendance')
+                finally:
+                    if handle is not None:
+                        self.driver.close()
+            self._report_page_timings("attendance", page_timings)
+            return records
+        finally:
+            # Close anything left open by an error and return to the main tab
+            for _, handle, _ in tabs:
+                if handle is not None and handle in self.driver.window_handles:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+            self.driver.switch_to.window(main_handle)
+
+    def _report_page_timings(self, section, page_timings):
+        """Stores and prints (label, seconds) pairs for the pages of one section."""
+        self.page_timings[section] = page_timings
+        print(f"    - Page timings for {section} ({len(page_timings)} pages):")
+        for label, seconds in page_timings:
+            print(f"      · {label}: {seconds:.2f}s")
+
+    def _scrape_attendance_http(self):
+        print("--- 3. Scraping Attendance (HTTP) ---")
+        summary = self.http.fetch(URLS["attendance"])
+        container = summary.find(self._get_xpath("attendance_summary.subject_cards_container"))
+        if container is None:
+            return False
+        subject_cards = summary.find_all(self._get_xpath("attendance_summary.subject_cards"), container)
+        if not subject_cards:
+            return False  # Cards are rendered by JavaScript
+        subject_urls = [summary.find(".//a/@href", card) for card in subject_cards]
+
+        subject_urls = [url for url in subject_urls if url]
+
+        def fetch(url):
+            start = time.perf_counter()
+            page = self.http.fetch(url)
+            return page, time.perf_counter() - start
+
+        # Download every detail page concurrently, then parse them in one pass
+        pages = []
+        if subject_urls:
+            with ThreadPoolExecutor(max_workers=min(ATTENDANCE_FETCH_WORKERS, len(subject_urls))) as executor:
+                pages = list(executor.map(fetch, subject_urls))
+
+        records = []
+        page_timings = []
+        for page, seconds in pages:
+            course_name = page.find(self._get_xpath("attendance_detail.course_name"))
+            if course_name is None:
+                return False  # Detail page is rendered by JavaScript
+            records.append({
+                "course_name": page.text(course_name),
+                "conducted": page.text(page.find(self._get_xpath("attendance_detail.conducted_classes"))),
+                "attended": page.text(page.find(self._get_xpath("attendance_detail.attended_classes"))),
+                "percentage": page.text(page.find(self._get_xpath("attendance_detail.percentage")))
+            })
+            page_timings.append((records[-1]["course_name"], seconds))
+        self._report_page_timings("attendance", page_timings)
+        self.erp_data['attendance'] = records
+        print(f"    - Scraped attendance for {len(records)} courses.")
+        return True
 
     
     def _scrape_results(self):
         print("--- 4. Scraping Results ---")
         try:
             self.driver.get(URLS["results"])
-            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(self._get_locator("results_summary.page_header")))
+            self._wait("results", "results_summary.page_header")
             
-            previous_courses_tab = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable(self._get_locator("results_summary.previous_courses_tab"))
-            )
+            previous_courses_tab = self._wait("results_tab", "results_summary.previous_courses_tab", condition="clickable")
             previous_courses_tab.click()
             
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located(self._get_locator("results_summary.term_summary_rows"))
-            )
-            
-            all_results = []
-            current_semester_data = None
-            
-            all_rows = self.driver.find_elements(By.XPATH, "//table[contains(@class, 'table_tree')]/tbody/tr")
+            # The tab switches without a page load, so the loaded page is no sign the rows are missing
+            self._wait("results_rows", "results_summary.term_summary_rows",
+                       empty_scope="results_summary.empty_scope", fast_fail=False)
 
-            for row in all_rows:
-                row_class = row.get_attribute("class")
-                
-                if "table-parent-row" in row_class:
-                    cols = row.find_elements(By.TAG_NAME, 'td')
-                    if len(cols) >= 6:
-                        current_semester_data = {
-                            "term": cols[0].text.strip(),
-                            "gpa": cols[4].text.strip(),
-                            "cgpa": cols[5].text.strip(),
-                            "courses": []
-                        }
-                        all_results.append(current_semester_data)
-
-                elif "table-child-row" in row_class and current_semester_data:
-                    cols = row.find_elements(By.TAG_NAME, 'td')
-                    if len(cols) == 4:
-                        # --- FIX: Use .get_attribute('textContent') for hidden elements ---
-                        course_detail = {
-                            "course_name": cols[0].get_attribute('textContent').strip(),
-                            "credits": cols[1].get_attribute('textContent').strip(),
-                            "marks_obtained": cols[2].get_attribute('textContent').strip(),
-                            "final_grade": cols[3].get_attribute('textContent').strip()
-                        }
-                        current_semester_data["courses"].append(course_detail)
-            
+            if self._reuse_if_unchanged("semester_results", self._section_fingerprint("semester_results")):
+                return
+
+            rows = self._read_table_rows("results_summary.all_rows")
+
+            all_results = build_semester_results(rows)
             self.erp_data['semester_results'] = all_results
             print(f"    - Scraped detailed results for {len(all_results)} semesters.")
             
+        except ContentMissing as e:
+            self._handle_missing_section('semester_results', [], e)
         except Exception as e:
             print(f"    - ⚠️ Error scraping results: {e}")
+            self.failed_sections.add('semester_results')
+
+    def _scrape_results_http(self):
+        print("--- 4. Scraping Results (HTTP) ---")
+        page = self.http.fetch(URLS["results"], validator=self._previous_validator("semester_results"))
+        if page.not_modified and self._reuse_if_unchanged("semester_results", self._section_fingerprint("semester_results", page)):
+            return True
+        table_rows = page.find_all(self._get_xpath("results_summary.all_rows"))
+        if not table_rows:
+            return False  # Table is filled in by JavaScript
+        if self._reuse_if_unchanged("semester_results", self._section_fingerprint("semester_results", page)):
+            return True
+        rows = [(row.get("class", ""), [page.text(td) for td in row.xpath("./td")]) for row in table_rows]
+        all_results = build_semester_results(rows)
+        self.erp_data['semester_results'] = all_results
+        print(f"    - Scraped detailed results for {len(all_results)} semesters.")
+        return True
 
 
 
@@ -300,95 +834,106 @@ class EnhancedErpScraper:
         print("--- 5. Scraping Invoices ---")
         try:
             self.driver.get(URLS["invoices"])
-            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(self._get_locator("invoices_page.page_header")))
-            rows = self.driver.find_elements(*self._get_locator("invoices_page.table_rows"))
-            
-            total_balance = 0.0
-            for row in rows:
-                cols = row.find_elements(By.TAG_NAME, 'td')
-                if len(cols) >= 9:
-                    try:
-                        balance_float = float(cols[8].text.strip())
-                        total_balance += balance_float
-                    except ValueError: continue
-            
+            self._wait("invoices", "invoices_page.page_header", empty_scope="invoices_page.empty_scope")
+            rows = self._read_table_rows("invoices_page.table_rows")
+            balances = [cols[8] for _, cols in rows if len(cols) >= 9]
+
+            total_balance = total_invoice_balance(balances)
             self.erp_data['financials'] = {"total_remaining_balance": total_balance}
             print(f"    - Calculated total remaining balance: {total_balance}")
+        except ContentMissing as e:
+            self._handle_missing_section('financials', {"total_remaining_balance": 0.0}, e)
         except Exception as e:
             print(f"    - ⚠️ Error scraping invoices: {e}")
+            self.failed_sections.add('financials')
+
+    def _scrape_invoices_http(self):
+        print("--- 5. Scraping Invoices (HTTP) ---")
+        page = self.http.fetch(URLS["invoices"])
+        if page.find(self._get_xpath("invoices_page.page_header")) is None:
+            return False
+        table_rows = page.find_all(self._get_xpath("invoices_page.table_rows"))
+        if not table_rows:
+            return False  # Table is filled in by JavaScript
+        balances = []
+        for row in table_rows:
+            cols = row.xpath("./td")
+            if len(cols) >= 9:
+                balances.append(page.text(cols[8]))
+
+        total_balance = total_invoice_balance(balances)
+        self.erp_data['financials'] = {"total_remaining_balance": total_balance}
+        print(f"    - Calculated total remaining balance: {total_balance}")
+        return True
 
 
     def _scrape_timetable(self):
         print("--- 6. Scraping Time Table ---")
         try:
             self.driver.get(URLS["timetable"])
-            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(self._get_locator("timetable_page.header")))
-            
-            groups = self.driver.find_elements(*self._get_locator("timetable_page.day_groups"))
+            self._wait("timetable", "timetable_page.header", empty_scope="timetable_page.empty_scope")
+
+            if self._reuse_if_unchanged("timetable", self._section_fingerprint("timetable")):
+                return
+
             timetable = {}
-            
-            for group in groups:
-                day = group.find_element(By.XPATH, ".//div[@class='cd-schedule__top-info']/span").text
-                timetable[day] = []
-                
-                events = group.find_elements(By.XPATH, ".//li[@class='cd-schedule__event']")
-                
-                for event in events:
-                    anchor = event.find_element(By.TAG_NAME, 'a')
-                    
-                    # --- START: MODIFIED LOGIC ---
-                    
-                    # 1. Get the raw text, replacing newlines with a clear delimiter
-                    full_details_string = anchor.text.replace('\n', ' | ')
-                    
-                    # 2. Prepare default values
-                    course_name = full_details_string  # Default to the full string
-                    venue = "N/A"
-                    
-                    # 3. Parse the string
-                    try:
-                        parts = [p.strip() for p in full_details_string.split('|')]
-                        
-                        if len(parts) > 0:
-                            course_name = parts[0]  # The first part is the course name
-                        
-                        if len(parts) > 2:
-                            venue = parts[2]  # The third part is the venue
-                            
-                    except Exception as e:
-                        print(f"    - Could not parse event string: '{full_details_string}'. Error: {e}")
-
-                    # 4. Append the structured dictionary to the timetable
-                    timetable[day].append({
-                        "time": f"{anchor.get_attribute('data-start')} - {anchor.get_attribute('data-end')}",
-                        "details": course_name, # The cleaned course name
-                        "venue": venue          # The extracted venue
-                    })
-                    
-                    # --- END: MODIFIED LOGIC ---
+            for day, events in self._read_timetable_days():
+                timetable[day] = [parse_timetable_event(text, start, end) for text, start, end in events]
 
             self.erp_data['timetable'] = timetable
             print(f"    - Found schedule for {len(timetable)} days.")
+        except ContentMissing as e:
+            self._handle_missing_section('timetable', {}, e)
         except Exception as e:
             print(f"    - ⚠️ Error scraping timetable: {e}")
+            self.failed_sections.add('timetable')
+
+    def _scrape_timetable_http(self):
+        print("--- 6. Scraping Time Table (HTTP) ---")
+        page = self.http.fetch(URLS["timetable"], validator=self._previous_validator("timetable"))
+        if page.not_modified and self._reuse_if_unchanged("timetable", self._section_fingerprint("timetable", page)):
+            return True
+        if page.find(self._get_xpath("timetable_page.header")) is None:
+            return False
+        groups = page.find_all(self._get_xpath("timetable_page.day_groups"))
+        if not groups:
+            return False  # Schedule is built by JavaScript
+        if self._reuse_if_unchanged("timetable", self._section_fingerprint("timetable", page)):
+            return True
+
+        timetable = {}
+        for group in groups:
+            day = page.text(page.find(".//div[@class='cd-schedule__top-info']/span", group))
+            timetable[day] = []
+            for anchor in page.find_all(".//li[@class='cd-schedule__event']//a", group):
+                timetable[day].append(parse_timetable_event(
+                    "\n".join(page.lines(anchor)), anchor.get("data-start"), anchor.get("data-end")
+                ))
+
+        self.erp_data['timetable'] = timetable
+        print(f"    - Found schedule for {len(timetable)} days.")
+        return True
 
 
     def _scrape_enrolled_courses(self):
         print("--- 7. Scraping Enrolled Courses (Final Production Version) ---")
         try:
             self.driver.get(URLS["dashboard"])
-            container_locator = (By.ID, "hierarchical-show")
-            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(container_locator))
+            self._wait("enrolled_courses", "enrolled_courses.container")
             
-            course_cards = self.driver.find_elements(By.CSS_SELECTOR, "#hierarchical-show a")
+            if self.bulk_extraction:
+                card_texts = self.driver.execute_script(NODE_TEXTS_SCRIPT, "#hierarchical-show a")
+            else:
+                card_texts = [card.get_attribute("textContent") for card in
+                              self.driver.find_elements(By.CSS_SELECTOR, "#hierarchical-show a")]
             enrolled_courses = []
             
-            print(f"    - Found {len(course_cards)} course cards. Parsing with final logic...")
+            print(f"    - Found {len(card_texts)} course cards. Parsing with final logic...")
 
-            for card in course_cards:
+            for card_text in card_texts:
                 try:
                     # 1. Get the raw text content from the card. This is our single source of truth.
-                    full_text_raw = card.get_attribute("textContent").strip()
+                    full_text_raw = (card_text or "").strip()
                     if not full_text_raw:
                         continue
                         
@@ -433,19 +978,234 @@ class EnhancedErpScraper:
             self.erp_data['enrolled_courses'] = enrolled_courses
             print(f"    - Successfully parsed {len(enrolled_courses)} courses.")
 
+        except ContentMissing as e:
+            self._handle_missing_section('enrolled_courses', [], e)
         except Exception as e:
             print(f"    - ⚠️ FATAL Error during enrolled course scraping: {e}")
-    def scrape_all_data(self):
+            self.failed_sections.add('enrolled_courses')
+
+    def _section_fingerprint(self, section, page=None):
+        """
+        A cheap fingerprint of a section: the HTTP validator when the server sends one,
+        otherwise a hash of the row count and the summary rows' text.
+        Reads the browser's current page, or `page` when the HTTP backend fetched it.
+        """
+        if page is not None and page.validator:
+            return VALIDATOR_PREFIX + page.validator
+
+        count_key, text_key = FINGERPRINT_LOCATORS[section]
+        if page is None:
+            summary = self.driver.execute_script(FINGERPRINT_SCRIPT, self._get_xpath(count_key), self._get_xpath(text_key))
+        else:
+            texts = [page.text(node) for node in page.find_all(self._get_xpath(text_key))]
+            summary = "\n".join([str(len(page.find_all(self._get_xpath(count_key))))] + texts)
+        return hashlib.sha1(summary.encode("utf-8")).hexdigest()
+
+    def _previous_validator(self, section):
+        """The ETag/Last-Modified value stored for a section by the previous scrape, if any."""
+        previous = self.previous_snapshot["fingerprints"].get(section, "")
+        return previous[len(VALIDATOR_PREFIX):] if previous.startswith(VALIDATOR_PREFIX) else None
+
+    def _reuse_if_unchanged(self, section, fingerprint):
+        """
+        Records a section's fingerprint. If it matches the previous snapshot, the
+        previous data is reused, the full parse is skipped and True is returned.
+        """
+        self.fingerprints[section] = fingerprint
+        previous_data = self.previous_snapshot["data"].get(section)
+        if previous_data is None or self.previous_snapshot["fingerprints"].get(section) != fingerprint:
+            return False
+        self.erp_data[section] = previous_data
+        self.skipped_sections.append(section)
+        print(f"    - Unchanged since the last scrape, skipped parsing {section}.")
+        return True
+
+    def _scrape_section_http(self, section):
+        """Tries the HTTP scraper for a section. Returns False if Selenium must be used."""
+        if self.http is None or section not in HTTP_SECTION_SCRAPERS:
+            return False
         try:
-            self._login()
-            scraping_tasks = [
-                self._scrape_dashboard, self._scrape_attendance, self._scrape_results,
-                self._scrape_invoices, self._scrape_timetable,self._scrape_enrolled_courses
-            ]
-            for task in scraping_tasks:
-                task()
+            return getattr(self, HTTP_SECTION_SCRAPERS[section])()
+        except Exception as e:
+            print(f"    - ⚠️ HTTP backend failed for {section}, falling back to Selenium: {e}")
+            return False
+
+    def _run_section(self, section):
+        """Runs the scraper method for one section and records how long it took."""
+        start = time.perf_counter()
+        if self._scrape_section_http(section):
+            self.section_backends[section] = "http"
+        else:
+            getattr(self, SECTION_SCRAPERS[section])()
+            self.section_backends[section] = "selenium"
+        elapsed = time.perf_counter() - start
+        self.timings[section] = elapsed
+        return elapsed
+
+    def _make_worker(self, driver):
+        """A scraper for one parallel browser that shares this scraper's settings and snapshot."""
+        worker = EnhancedErpScraper(self.roll_no, self.password, driver=driver, backend=self.backend,
+                                    waiter=self.waiter, bulk_extraction=self.bulk_extraction)
+        worker.http = self.http  # requests.Session is safe to share for plain GETs
+        worker.previous_snapshot = self.previous_snapshot
+        return worker
+
+    def _spawn_worker(self, cookies):
+        """
+        Creates a second scraper whose browser reuses this session's login cookies.
+        With a driver_pool the browser is borrowed from the pool (without waiting, so a
+        busy pool means fewer workers); otherwise a new one is started.
+        worker.release_driver() hands it back or quits it.
+        """
+        release = ExitStack()
+        if self.driver_pool is not None:
+            driver = release.enter_context(self.driver_pool.lease(timeout=0))
+        else:
+            driver = create_firefox_driver()
+            release.callback(driver.quit)
+        try:
+            # Cookies can only be added for the domain that is currently loaded
+            driver.get(URLS["login"])
+            for cookie in cookies:
+                driver.add_cookie({k: cookie[k] for k in COOKIE_FIELDS if k in cookie})
+        except Exception:
+            release.close()
+            raise
+        worker = self._make_worker(driver)
+        worker.release_driver = release.close
+        return worker
+
+    def _scrape_sections_parallel(self, sections, max_workers):
+        """
+        Runs the section scrapers concurrently on a small pool of logged-in browsers.
+        Each browser has its own worker scraper (the main browser too), and their results
+        are merged into this scraper under a lock.
+        """
+        cookies = self.driver.get_cookies()
+        worker_count = max(1, min(max_workers, len(sections)))
+
+        extra_workers = []
+        idle_workers = queue.Queue()
+        idle_workers.put(self._make_worker(self.driver))  # The main browser is already logged in
+
+        try:
+            if worker_count > 1:
+                print(f"--- Starting {worker_count - 1} extra browser(s) for parallel scraping ---")
+                with ThreadPoolExecutor(max_workers=worker_count - 1) as spawner:
+                    futures = [spawner.submit(self._spawn_worker, cookies) for _ in range(worker_count - 1)]
+                    for future in as_completed(futures):
+                        try:
+                            worker = future.result()
+                        except Exception as e:
+                            print(f"    - ⚠️ Could not start a worker browser: {e}")
+                            continue
+                        extra_workers.append(worker)
+                        idle_workers.put(worker)
+                if len(extra_workers) < worker_count - 1:
+                    print(f"    - ⚠️ Only {1 + len(extra_workers)} of {worker_count} browsers are available; "
+                          f"scraping with less parallelism.")
+
+            def run(section):
+                worker = idle_workers.get()
+                try:
+                    worker._run_section(section)
+                    with self._merge_lock:
+                        self._merge_worker_section(worker, section)
+                        self._section_done(section)
+                finally:
+                    idle_workers.put(worker)
+
+            with ThreadPoolExecutor(max_workers=1 + len(extra_workers)) as executor:
+                for future in as_completed([executor.submit(run, section) for section in sections]):
+                    future.result()
+        finally:
+            for worker in extra_workers:
+                worker.release_driver()
+
+    def _merge_worker_section(self, worker, section):
+        """Copies one section's data and measurements from a worker scraper."""
+        if section in worker.erp_data:
+            self.erp_data[section] = worker.erp_data[section]
+        self.timings[section] = worker.timings[section]
+        self.section_backends[section] = worker.section_backends.get(section)
+        if section in worker.page_timings:
+            self.page_timings[section] = worker.page_timings[section]
+        if section in worker.fingerprints:
+            self.fingerprints[section] = worker.fingerprints[section]
+        if section in worker.skipped_sections:
+            self.skipped_sections.append(section)
+        if section in worker.failed_sections:
+            self.failed_sections.add(section)
+
+    def _section_done(self, section):
+        if self.on_section is not None:
+            failed = section in self.failed_sections
+            self.on_section(section, None if failed else self.erp_data.get(section))
+
+    def _print_timing_report(self, mode):
+        print(f"\n--- Timing Breakdown ({mode}) ---")
+        for step, seconds in self.timings.items():
+            backend = self.section_backends.get(step)
+            print(f"    - {step:<18} {seconds:6.2f}s" + (f"  [{backend}]" if backend else "")
+                  + ("  (unchanged, skipped)" if step in self.skipped_sections else ""))
+
+    def scrape_all_data(self, parallel=False, max_workers=PARALLEL_WORKERS, sections=None, snapshot=None, on_section=None):
+        """
+        Logs in once and scrapes every section (or only the given `sections`) into erp_data.
+        With a session_store, a saved session that is still valid replaces the login form.
+        With parallel=True the sections run concurrently on up to `max_workers`
+        browsers that share the login cookies; otherwise they run one after another.
+        With the "http" backend, server-rendered sections are fetched without the browser.
+        Passing the `snapshot` of a previous scrape ({"fingerprints": ..., "data": ...})
+        enables incremental mode: sections whose fingerprint is unchanged reuse the old
+        data instead of being parsed again; they are listed in self.skipped_sections.
+        Sections that raised an error are listed in self.failed_sections (erp_data may
+        hold a placeholder for them, e.g. the profile) and should not be cached.
+        `on_section(section, data)` is called as each section finishes (data is None
+        if the section could not be scraped), e.g. to report progress.
+        """
+        self.on_section = on_section
+        self.timings = {}
+        self.page_timings = {}
+        self.section_backends = {}
+        self.fingerprints = {}
+        self.skipped_sections = []
+        self.failed_sections = set()
+        self.previous_snapshot = {
+            "fingerprints": (snapshot or {}).get("fingerprints") or {},
+            "data": (snapshot or {}).get("data") or {},
+        }
+        total_start = time.perf_counter()
+        try:
+            login_start = time.perf_counter()
+            self.reused_session = self._restore_session()
+            if not self.reused_session:
+                self._login()
+                self._save_session()
+            self.timings["login"] = time.perf_counter() - login_start
+
+            if self.backend == "http":
+                self.http = ErpHttpSession.from_driver(self.driver)
+
+            sections = [s for s in SECTION_SCRAPERS if sections is None or s in sections]
+            if parallel:
+                self._scrape_sections_parallel(sections, max_workers)
+            else:
+                for section in sections:
+                    self._run_section(section)
+                    self._section_done(section)
+
+            self.timings["total"] = time.perf_counter() - total_start
+            self._print_timing_report("parallel" if parallel else "sequential")
+            if self.skipped_sections:
+                print(f"--- Skipped unchanged sections: {', '.join(self.skipped_sections)} ---")
+            print(f"--- Adaptive wait deadlines: {self.waiter.stats()} ---")
             return self.erp_data
         except Exception as e:
             print(f"❌ A critical error occurred: {e}")
             self.driver.save_screenshot("critical_error_screenshot.png")
             return {"error": str(e)}
+        finally:
+            if self.http is not None:
+                self.http.close()
+                self.http = None
@@ -0,0 +1,142 @@
+import time
+import threading
+from collections import deque
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from utils.percentiles import percentile
+
+# Samples needed before learned values replace the defaults
+MIN_SAMPLES = 5
+SAMPLE_HISTORY = 50
+POLL_SECONDS = 0.2
+
+CONDITIONS = {
+    "presence": EC.presence_of_element_located,
+    "visible": EC.visibility_of_element_located,
+    "clickable": EC.element_to_be_clickable,
+}
+
+
+class ContentMissing(Exception):
+    """The page finished loading but the awaited element did not appear."""
+
+    def __init__(self, page_key, empty_state):
+        self.page_key = page_key
+        # True when the page showed an explicit "no records" marker
+        self.empty_state = empty_state
+        reason = "shows an empty state" if empty_state else "loaded without the expected content"
+        super().__init__(f"The '{page_key}' page {reason}.")
+
+
+def _shows_empty_state(driver, scope_locator, marker_locator):
+    """True when a visible `marker_locator` node sits inside a visible `scope_locator` container."""
+    try:
+        for scope in driver.find_elements(*scope_locator):
+            if scope.is_displayed() and any(m.is_displayed() for m in scope.find_elements(*marker_locator)):
+                return True
+    except StaleElementReferenceException:
+        pass  # The page changed under us; look again on the next poll
+    return False
+
+
+class AdaptiveWaiter:
+    """
+    Waits for ERP page content with deadlines learned from earlier scrapes.
+    For each page it records how long the awaited element took to appear and, when it
+    was filled in after the document finished loading, how long after. The deadline
+    becomes the 95th percentile of the first times `headroom`. On pages with an explicit
+    empty-state marker, once the document is loaded the wait gives up after the 95th
+    percentile of the second (the "grace" period, never below `default_grace`) instead
+    of running into the full timeout. Until enough samples exist the caller's default
+    timeout and `default_grace` are used.
+    """
+
+    def __init__(self, min_timeout=2.0, max_timeout=20.0, headroom=1.5, default_grace=3.0):
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.headroom = headroom
+        self.default_grace = default_grace
+        self._load_times = {}
+        self._post_load_lags = {}
+        self._lock = threading.Lock()
+
+    def _samples(self, table, page_key):
+        with self._lock:
+            return list(table.get(page_key, ()))
+
+    def _record(self, table, page_key, seconds):
+        with self._lock:
+            table.setdefault(page_key, deque(maxlen=SAMPLE_HISTORY)).append(seconds)
+
+    def deadline(self, page_key, default_timeout):
+        samples = self._samples(self._load_times, page_key)
+        if len(samples) < MIN_SAMPLES:
+            return default_timeout
+        learned = percentile(samples, 0.95) * self.headroom
+        return min(self.max_timeout, max(self.min_timeout, learned))
+
+    def grace(self, page_key):
+        samples = self._samples(self._post_load_lags, page_key)
+        if len(samples) < MIN_SAMPLES:
+            return self.default_grace
+        return max(self.default_grace, percentile(samples, 0.95) * self.headroom)
+
+    def wait(self, driver, page_key, locator, condition="presence", empty_locator=None, default_timeout=10,
+             fast_fail=True):
+        """
+        Waits for `locator` and returns the element.
+        `empty_locator` is a (container, marker) pair of locators; the marker is searched
+        for inside the container and only visible nodes count.
+        Raises ContentMissing as soon as that marker is shown, or, when an `empty_locator`
+        is given, once the document has been fully loaded for the grace period without
+        the element. Waits after a click that does not load a page (e.g. a tab) should
+        pass fast_fail=False, as the page reports itself loaded from the start.
+        Raises TimeoutException if the element has not appeared by the deadline.
+        """
+        expected = CONDITIONS[condition](locator)
+        grace = self.grace(page_key)
+        fast_fail = fast_fail and empty_locator is not None
+        start = time.perf_counter()
+        state = {"loaded_at": None}
+
+        def check(d):
+            try:
+                element = expected(d)
+            except (NoSuchElementException, StaleElementReferenceException):
+                element = False
+            if element:
+                return element
+            if empty_locator and _shows_empty_state(d, *empty_locator):
+                raise ContentMissing(page_key, empty_state=True)
+            now = time.perf_counter()
+            if d.execute_script("return document.readyState") != "complete":
+                state["loaded_at"] = None  # A navigation is still in progress
+            elif state["loaded_at"] is None:
+                state["loaded_at"] = now
+            elif fast_fail and now - state["loaded_at"] >= grace:
+                raise ContentMissing(page_key, empty_state=False)
+            return False
+
+        try:
+            element = WebDriverWait(driver, self.deadline(page_key, default_timeout), poll_frequency=POLL_SECONDS).until(check)
+        except TimeoutException:
+            raise TimeoutException(f"Timed out waiting for the '{page_key}' page.")
+
+        found_at = time.perf_counter()
+        self._record(self._load_times, page_key, found_at - start)
+        if state["loaded_at"] is not None:
+            # Only content filled in after the load tells how long the grace must be
+            self._record(self._post_load_lags, page_key, found_at - state["loaded_at"])
+        return element
+
+    def stats(self):
+        """Current deadline and grace period (in seconds) for every page seen so far."""
+        with self._lock:
+            pages = list(self._load_times)
+        return {page: {"deadline": round(self.deadline(page, self.max_timeout), 2),
+                       "grace": round(self.grace(page), 2)} for page in pages}
+
+
+# Shared by every scraper in the process so all logins learn from each other
+default_waiter = AdaptiveWaiter()
@@ -0,0 +1,166 @@
+import os
+import re
+import json
+import math
+import hashlib
+from collections import Counter, defaultdict
+
+# Words, numbers and compounds such as "12.3", "cs-101" or "3.00/4.0"
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.\-/][a-z0-9]+)*")
+SEPARATOR_PATTERN = re.compile(r"[.\-/]")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with "
+    "what which who whom how when where why do does can i my me you your shall should".split()
+)
+INDEX_VERSION = 1
+
+
+def tokenize(text):
+    """
+    Lower-cased terms without stopwords. Compounds are kept whole (so "Rule 12.3" matches
+    exactly) and also indexed by their parts and joined form ("cs-101" -> "cs", "101", "cs101").
+    """
+    terms = []
+    for token in TOKEN_PATTERN.findall(str(text).lower()):
+        if token in STOPWORDS:
+            continue
+        terms.append(token)
+        parts = SEPARATOR_PATTERN.split(token)
+        if len(parts) > 1:
+            terms.append("".join(parts))
+            terms.extend(p for p in parts if p not in STOPWORDS)
+    return terms
+
+
+def file_fingerprint(path):
+    """SHA-1 of a file's contents; the index is rebuilt when the chunks file changes."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """
+    Merges ranked lists of ids by reciprocal-rank fusion: each id scores sum(1 / (k + rank)).
+    Returns (id, score) pairs, best first.
+    """
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class Bm25Index:
+    """
+    An in-memory Okapi BM25 inverted index over the handbook chunks.
+    Chunk i gets the id "chunk_i", the same id build_vector_store.py gives it in ChromaDB,
+    so keyword and vector results can be fused. The index also keeps each chunk's text and
+    metadata, so keyword-only hits can be returned without another database call.
+    """
+
+    def __init__(self, ids, documents, metadatas, k1=1.5, b=0.75, fingerprint=None, postings=None, lengths=None):
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.metadatas = list(metadatas)
+        self.k1 = k1
+        self.b = b
+        self.fingerprint = fingerprint
+        self._position = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        if postings is None:
+            postings, lengths = self._build(self.documents)
+        self._postings = postings  # term -> [(doc index, term frequency)]
+        self._lengths = lengths
+        self._average_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+    @staticmethod
+    def _build(documents):
+        postings, lengths = defaultdict(list), []
+        for i, document in enumerate(documents):
+            terms = tokenize(document)
+            lengths.append(len(terms))
+            for term, frequency in Counter(terms).items():
+                postings[term].append((i, frequency))
+        return dict(postings), lengths
+
+    @classmethod
+    def from_chunks(cls, chunks, fingerprint=None):
+        return cls(
+            ids=[f"chunk_{i}" for i in range(len(chunks))],
+            documents=[chunk['content'] for chunk in chunks],
+            metadatas=[chunk['metadata'] for chunk in chunks],
+            fingerprint=fingerprint,
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, query, top_k=20):
+        """The best `top_k` (id, score) pairs for `query`."""
+        total = len(self.ids)
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for i, frequency in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / self._average_length)
+                scores[i] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(self.ids[i], score) for i, score in best]
+
+    def get(self, doc_id):
+        """(document, metadata) of a chunk id."""
+        i = self._position[doc_id]
+        return self.documents[i], self.metadatas[i]
+
+    # --- Persistence ---
+    def save(self, path):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        payload = {
+            "version": INDEX_VERSION, "fingerprint": self.fingerprint, "k1": self.k1, "b": self.b,
+            "ids": self.ids, "documents": self.documents, "metadatas": self.metadatas,
+            "lengths": self._lengths, "postings": self._postings,
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported BM25 index version {payload.get('version')}")
+        postings = {term: [tuple(p) for p in entries] for term, entries in payload["postings"].items()}
+        return cls(payload["ids"], payload["documents"], payload["metadatas"], k1=payload["k1"], b=payload["b"],
+                   fingerprint=payload["fingerprint"], postings=postings, lengths=payload["lengths"])
+
+
+def load_or_build_index(chunks_path, index_path):
+    """
+    Loads the persisted index, or builds it from the chunks file and saves it when it is
+    missing or was built from a different version of that file.
+    """
+    fingerprint = file_fingerprint(chunks_path)
+    if os.path.exists(index_path):
+        try:
+            index = Bm25Index.load(index_path)
+            if index.fingerprint == fingerprint:
+                return index
+            print("    - BM25 index is out of date, rebuilding...")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"    - ⚠️ Could not read BM25 index ({e}), rebuilding...")
+
+    with open(chunks_path, "r", encoding="utf-8") as f:
+        chunks = json.load(f)
+    index = Bm25Index.from_chunks(chunks, fingerprint=fingerprint)
+    index.save(index_path)
+    print(f"    - Built BM25 index over {len(index)} chunks: {index_path}")
+    return index
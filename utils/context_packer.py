@@ -0,0 +1,113 @@
+import json
+import threading
+from utils.table_format import compact_tables
+
+# Llama 3's tokenizer is a tiktoken BPE that extends cl100k_base, so counts are close
+TOKENIZER_ENCODING = "cl100k_base"
+CHARS_PER_TOKEN = 4
+
+
+class TokenCounter:
+    """
+    Counts tokens with a local tiktoken encoding, loaded on first use. Without tiktoken
+    (or its encoding file) it falls back to about four characters per token.
+    """
+
+    def __init__(self, encoding_name=TOKENIZER_ENCODING):
+        self.encoding_name = encoding_name
+        self._encoding = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def approximate(self):
+        return self._load() is None
+
+    def _load(self):
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                try:
+                    import tiktoken
+                    self._encoding = tiktoken.get_encoding(self.encoding_name)
+                except Exception as e:
+                    print(f"    - ⚠️ Tokenizer '{self.encoding_name}' unavailable, estimating tokens from length: {e}")
+            return self._encoding
+
+    def count(self, text):
+        encoding = self._load()
+        if encoding is None:
+            return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+        return len(encoding.encode(text, disallowed_special=()))
+
+
+def minify_json(data):
+    """JSON without indentation or spaces after separators."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+class ContextPacker:
+    """
+    Fits retrieved handbook excerpts into a prompt token budget. Excerpts are compacted
+    (HTML tables become dense markdown) and added in relevance order while they fit;
+    an excerpt that does not fit is skipped so a smaller, less relevant one can still go in.
+    Conversation history is trimmed first (oldest turns first) so the fixed part of the
+    prompt stays within the budget.
+    """
+
+    def __init__(self, token_counter, budget_tokens=6000):
+        self.token_counter = token_counter
+        self.budget_tokens = budget_tokens
+
+    def fit_history(self, fixed_texts, history):
+        """
+        The most recent `history` turns (oldest first, as given) that fit in the budget
+        together with `fixed_texts`; older turns are dropped first.
+        """
+        remaining = self.budget_tokens - sum(self.token_counter.count(text) for text in fixed_texts)
+        kept = []
+        for turn in reversed(history):
+            tokens = self.token_counter.count(turn) + 1  # Turns are joined with newlines
+            if tokens > remaining:
+                break
+            kept.append(turn)
+            remaining -= tokens
+        if len(kept) < len(history):
+            print(f"    - Dropped the {len(history) - len(kept)} oldest conversation turns to fit "
+                  f"the {self.budget_tokens}-token prompt budget.")
+        return kept[::-1]
+
+    def pack(self, fixed_texts, documents, document_prefix=""):
+        """
+        `fixed_texts` are the parts of the prompt that are always sent (system prompt,
+        question, summary, ...); `document_prefix` is the heading put before each excerpt.
+        Returns (compacted documents that fit, report dict).
+        """
+        fixed_tokens = sum(self.token_counter.count(text) for text in fixed_texts)
+        remaining = self.budget_tokens - fixed_tokens
+        prefix_tokens = self.token_counter.count(document_prefix) if document_prefix else 0
+        packed, dropped, raw_tokens, packed_tokens = [], 0, 0, 0
+        for document in documents:
+            compacted = compact_tables(document)
+            raw_tokens += self.token_counter.count(document)
+            tokens = self.token_counter.count(compacted) + prefix_tokens
+            if tokens > remaining:
+                dropped += 1
+                continue
+            packed.append(compacted)
+            packed_tokens += tokens
+            remaining -= tokens
+        if documents and not packed:
+            print(f"    - ⚠️ No handbook excerpt fits in the {self.budget_tokens}-token prompt budget "
+                  f"({fixed_tokens} tokens are taken by the rest of the prompt).")
+        report = {
+            "prompt_tokens": fixed_tokens + packed_tokens,
+            "budget": self.budget_tokens,
+            "fixed_tokens": fixed_tokens,
+            "context_tokens": packed_tokens,
+            "context_tokens_uncompacted": raw_tokens,
+            "excerpts": len(packed),
+            "dropped": dropped,
+            "approximate": self.token_counter.approximate,
+        }
+        return packed, report
@@ -0,0 +1,192 @@
+import time
+import queue
+import threading
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from utils.percentiles import percentile
+
+# How many wait-time samples are kept for the metrics
+WAIT_SAMPLES = 500
+
+
+class DriverPool:
+    """
+    A process-wide pool of pre-started headless browsers.
+    Each scrape borrows a driver with `with pool.lease() as driver:`; when it is
+    returned the cookies and storage are wiped so the next user starts clean.
+    Cookies and storage can only be cleared for the origin of the loaded page, so
+    `reset_url` (a page of the site being scraped, e.g. its login page) is loaded first.
+    A driver is replaced after `max_uses` scrapes or as soon as it stops responding.
+    """
+
+    def __init__(self, driver_factory, size=2, max_uses=20, prestart=True, reset_url=None):
+        self._factory = driver_factory
+        self.reset_url = reset_url
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+
+        self._idle = queue.Queue()
+        self._uses = {}  # id(driver) -> number of completed leases
+        self._lock = threading.Lock()
+        self._live = 0   # drivers that exist (idle, lent out or starting)
+        self._closed = False  # Set by shutdown(); no driver is started or re-queued after it
+
+        self._wait_times = deque(maxlen=WAIT_SAMPLES)
+        self._counters = {"leases": 0, "created": 0, "recycled": 0, "crashed": 0}
+
+        if prestart:
+            threading.Thread(target=self._prestart, daemon=True).start()
+
+    # --- Driver lifecycle ---
+    def _reserve_slot(self):
+        with self._lock:
+            if self._closed or self._live >= self.size:
+                return False
+            self._live += 1
+            return True
+
+    def _start_driver(self):
+        """Starts a driver in an already reserved slot."""
+        try:
+            driver = self._factory()
+        except Exception:
+            with self._lock:
+                self._live -= 1
+            raise
+        with self._lock:
+            self._uses[id(driver)] = 0
+            self._counters["created"] += 1
+        return driver
+
+    def _prestart(self):
+        while self._reserve_slot():
+            try:
+                driver = self._start_driver()
+            except Exception as e:
+                print(f"    - ⚠️ Could not pre-start a pooled browser: {e}")
+                return
+            self._put_idle(driver)
+
+    def _put_idle(self, driver):
+        """Makes a driver available for the next lease, or quits it if the pool was shut down."""
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._idle.put(driver)
+        if closed:
+            self._quit(driver)
+
+    def _quit(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self._live -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _discard(self, driver, crashed=False):
+        with self._lock:
+            self._counters["crashed" if crashed else "recycled"] += 1
+        self._quit(driver)
+        # Start a replacement in the background so the pool stays warm
+        if not self._closed:
+            threading.Thread(target=self._prestart, daemon=True).start()
+
+    def _reset(self, driver):
+        """Wipes everything the previous user left in the browser."""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        # The lease may have ended on another page (e.g. about:blank after an error);
+        # a page of the portal is only loaded when one is not already open
+        if self.reset_url and not self._same_origin(driver.current_url, self.reset_url):
+            driver.get(self.reset_url)
+        # Storage can only be cleared while a page of that origin is loaded
+        driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    @staticmethod
+    def _same_origin(url, other):
+        first, second = urlparse(url), urlparse(other)
+        return (first.scheme, first.netloc) == (second.scheme, second.netloc)
+
+    # --- Public API ---
+    def _acquire(self, timeout):
+        if self._closed:
+            raise RuntimeError("The browser pool has been shut down.")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        if self._reserve_slot():
+            return self._start_driver()
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No browser became available within {timeout} seconds.")
+
+    def _release(self, driver):
+        with self._lock:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            worn_out = self._uses[id(driver)] >= self.max_uses
+
+        if self._closed:
+            self._quit(driver)
+            return
+        if worn_out:
+            self._discard(driver)
+            return
+        try:
+            self._reset(driver)
+        except Exception as e:
+            print(f"    - ⚠️ Pooled browser stopped responding, replacing it: {e}")
+            self._discard(driver, crashed=True)
+            return
+        self._put_idle(driver)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """Lends a driver for the duration of the `with` block."""
+        start = time.perf_counter()
+        driver = self._acquire(timeout)
+        wait = time.perf_counter() - start
+        with self._lock:
+            self._wait_times.append(wait)
+            self._counters["leases"] += 1
+        try:
+            yield driver
+        finally:
+            self._release(driver)
+
+    def metrics(self):
+        """Pool size, usage counters and queue wait-time statistics (in seconds)."""
+        with self._lock:
+            waits = list(self._wait_times)
+            return {
+                "size": self.size,
+                "live": self._live,
+                "idle": self._idle.qsize(),
+                **self._counters,
+                "wait_p50": percentile(waits, 0.50),
+                "wait_p95": percentile(waits, 0.95),
+                "wait_max": max(waits, default=0.0),
+            }
+
+    def shutdown(self):
+        """
+        Quits every idle driver and stops starting new ones. Drivers still lent out
+        are quit when they are returned, and drivers still starting once they are up.
+        """
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
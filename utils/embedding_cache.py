@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+
+
+def normalize_text(text):
+    """Collapses whitespace so trivially different spellings of a query share an entry."""
+    return " ".join(str(text).split())
+
+
+class EmbeddingCache:
+    """
+    A thread-safe LRU cache in front of a SentenceTransformer, shared by every session.
+    Texts are normalized before they are encoded and used as keys, so a repeated
+    question skips the transformer forward pass. Hit/miss counters are kept for stats().
+    """
+
+    def __init__(self, model, max_entries=2048):
+        self.model = model
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()  # normalized text -> embedding (list of floats)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def encode(self, text):
+        """The embedding of `text` as a list of floats."""
+        key = normalize_text(text)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return embedding
+            self._misses += 1
+
+        # Encode outside the lock so other sessions' hits are not held up
+        embedding = self.model.encode(key).tolist()
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return embedding
+
+    def encode_many(self, texts):
+        """The embeddings of several texts; all cache misses are encoded in one batched call."""
+        keys = [normalize_text(text) for text in texts]
+        embeddings = {}
+        with self._lock:
+            for key in keys:
+                embedding = self._entries.get(key)
+                if embedding is not None:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    embeddings[key] = embedding
+                else:
+                    self._misses += 1
+        missing = [key for key in dict.fromkeys(keys) if key not in embeddings]
+
+        if missing:
+            vectors = [vector.tolist() for vector in self.model.encode(missing)]
+            with self._lock:
+                for key, embedding in zip(missing, vectors):
+                    self._entries[key] = embedding
+                    self._entries.move_to_end(key)
+                    embeddings[key] = embedding
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return [embeddings[key] for key in keys]
+
+    def stats(self):
+        """Entries, hits, misses and hit rate since the process started."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,110 @@
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import html as lxml_html
+
+# Connections kept alive per host by the pooled session
+HTTP_POOL_SIZE = 10
+# Seconds to wait for an ERP page before giving up on the HTTP path
+REQUEST_TIMEOUT = 15
+
+
+class SessionExpiredError(Exception):
+    """Raised when the ERP redirects an HTTP request back to the login page."""
+
+
+def locator_to_xpath(locator):
+    """Converts a LOCATORS entry like ("id", "login") into an XPath expression."""
+    kind, value = locator
+    if kind == "xpath":
+        return value
+    if kind == "id":
+        return f"//*[@id='{value}']"
+    if kind == "class_name":
+        return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {value} ')]"
+    raise ValueError(f"Locator type '{kind}' cannot be used with the HTTP backend.")
+
+
+class HttpPage:
+    """A parsed ERP page that can be queried with the same XPaths Selenium uses."""
+
+    def __init__(self, url, content, validator=None, not_modified=False):
+        self.url = url
+        # ETag or Last-Modified header, if the server sent one
+        self.validator = validator
+        # True when a conditional request came back "304 Not Modified" (there is no body)
+        self.not_modified = not_modified
+        self.tree = lxml_html.fromstring(content) if content else lxml_html.fromstring("<html></html>")
+        # Resolve relative links (e.g. attendance detail pages) against the page URL
+        self.tree.make_links_absolute(url)
+
+    def find_all(self, xpath, context=None):
+        return (context if context is not None else self.tree).xpath(xpath)
+
+    def find(self, xpath, context=None):
+        matches = self.find_all(xpath, context)
+        return matches[0] if matches else None
+
+    @staticmethod
+    def text(element):
+        """Whitespace-normalized text of an element, similar to Selenium's .text."""
+        if element is None:
+            return ""
+        return " ".join(element.text_content().split())
+
+    @staticmethod
+    def lines(element):
+        """The non-empty text nodes of an element, one per line."""
+        if element is None:
+            return []
+        return [t.strip() for t in element.xpath(".//text()") if t.strip()]
+
+
+class ErpHttpSession:
+    """
+    A pooled requests.Session that reuses the cookies of a logged-in Selenium
+    browser, so server-rendered ERP pages can be fetched without a browser.
+    """
+
+    def __init__(self, cookies, user_agent=None, pool_size=HTTP_POOL_SIZE, timeout=REQUEST_TIMEOUT):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie["name"], cookie["value"],
+                domain=cookie.get("domain"), path=cookie.get("path", "/")
+            )
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs):
+        """Builds a session from the cookies and user agent of a Selenium driver."""
+        user_agent = driver.execute_script("return navigator.userAgent;")
+        return cls(driver.get_cookies(), user_agent=user_agent, **kwargs)
+
+    def fetch(self, url, validator=None):
+        """
+        Downloads and parses a page. Raises SessionExpiredError if we were logged out.
+        Passing the `validator` of an earlier response makes the request conditional;
+        if the server answers 304 the returned page has not_modified=True and no content.
+        """
+        headers = {}
+        if validator:
+            header = "If-None-Match" if validator.startswith(('"', 'W/')) else "If-Modified-Since"
+            headers[header] = validator
+
+        response = self.session.get(url, timeout=self.timeout, headers=headers)
+        if response.status_code == 304:
+            return HttpPage(url, None, validator=validator, not_modified=True)
+        response.raise_for_status()
+        if "/web/login" in response.url and "/web/login" not in url:
+            raise SessionExpiredError(f"Redirected to the login page while fetching {url}")
+        new_validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+        return HttpPage(response.url, response.content, validator=new_validator)
+
+    def close(self):
+        self.session.close()
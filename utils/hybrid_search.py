@@ -0,0 +1,89 @@
+import re
+from utils.bm25_index import reciprocal_rank_fusion, tokenize
+
+# Sentence and clause boundaries that may separate the parts of a compound question
+QUESTION_BREAK_PATTERN = re.compile(r"[?;]+")
+CONJUNCTION_PATTERN = re.compile(r"\s*,?\s+(?:and also|as well as|and|also|plus)\s+", re.IGNORECASE)
+MAX_SUB_QUERIES = 4
+
+
+def split_question(question):
+    """
+    Splits a compound question into sub-queries: "attendance rules and fee refund policy" ->
+    [the whole question, "attendance rules", "fee refund policy"]. A part needs at least two
+    content words, so "terms and conditions" stays whole. The whole question always comes
+    first; a question that does not split is returned on its own.
+    """
+    question = " ".join(str(question).split())
+    parts = []
+    for sentence in QUESTION_BREAK_PATTERN.split(question):
+        clauses = CONJUNCTION_PATTERN.split(sentence)
+        if len(clauses) > 1 and all(len(tokenize(c)) >= 2 for c in clauses):
+            parts.extend(clauses)
+        elif sentence.strip():
+            parts.append(sentence)
+    parts = list(dict.fromkeys(p.strip(" ,.") for p in parts if tokenize(p)))
+    if len(parts) < 2:
+        return [question]
+    return [question] + parts[:MAX_SUB_QUERIES - 1]
+
+
+def _matches(metadata, where):
+    """Equality-only subset of ChromaDB's `where` syntax, e.g. {"source_file": "x.pdf"}."""
+    return all(metadata.get(key) == value for key, value in (where or {}).items())
+
+
+def _keyword_ranking(bm25_index, query, candidates, where):
+    if not where:
+        return [doc_id for doc_id, _ in bm25_index.search(query, top_k=candidates)]
+    # Over-fetch, since the filter drops hits
+    hits = bm25_index.search(query, top_k=candidates * 4)
+    return [doc_id for doc_id, _ in hits if _matches(bm25_index.get(doc_id)[1], where)][:candidates]
+
+
+def hybrid_search(collection, bm25_index, query_text, query_embedding, top_k=5, candidates=20, rrf_k=60,
+                  context_query=None, where=None):
+    """
+    Runs a dense ChromaDB query and a BM25 keyword search for `candidates` chunks each and
+    merges them by reciprocal-rank fusion. Returns the best `top_k` in the shape of a
+    collection.query result ({'ids': [[...]], 'documents': [[...]], 'metadatas': [[...]]}).
+    `context_query` is an optional second, keyword-only query (e.g. the student's situation)
+    fused in as a third ranking; `where` is an optional ChromaDB metadata filter that is
+    applied to the keyword hits too.
+    """
+    return multi_hybrid_search(collection, bm25_index, [query_text], [query_embedding], top_k=top_k,
+                               candidates=candidates, rrf_k=rrf_k, context_query=context_query, where=where)
+
+
+def multi_hybrid_search(collection, bm25_index, query_texts, query_embeddings, top_k=5, candidates=20, rrf_k=60,
+                        context_query=None, where=None):
+    """
+    hybrid_search for several sub-queries at once: one ChromaDB call with all their
+    embeddings and a BM25 search each. All rankings are fused together, so a chunk found
+    by several sub-queries appears once, and the top ranks of every sub-query are
+    interleaved into the `top_k`.
+    """
+    dense = collection.query(
+        query_embeddings=list(query_embeddings),
+        n_results=candidates,
+        where=where,
+        include=['documents', 'metadatas']
+    )
+    found = {}
+    rankings = []
+    for ids, documents, metadatas in zip(dense['ids'], dense['documents'], dense['metadatas']):
+        found.update((doc_id, (document, metadata)) for doc_id, document, metadata in zip(ids, documents, metadatas))
+        rankings.append(ids)
+    rankings.extend(_keyword_ranking(bm25_index, text, candidates, where) for text in query_texts)
+    if context_query:
+        # Fewer candidates, so the student's situation nudges the ranking instead of steering it
+        rankings.append(_keyword_ranking(bm25_index, context_query, max(1, candidates // 4), where))
+
+    ids, documents, metadatas = [], [], []
+    for doc_id, _ in reciprocal_rank_fusion(rankings, k=rrf_k)[:top_k]:
+        document, metadata = found[doc_id] if doc_id in found else bm25_index.get(doc_id)
+        ids.append(doc_id)
+        documents.append(document)
+        metadatas.append(metadata)
+
+    return {'ids': [ids], 'documents': [documents], 'metadatas': [metadatas]}
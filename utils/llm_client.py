@@ -0,0 +1,135 @@
+import time
+import random
+import threading
+import httpx
+import groq
+from groq import Groq
+
+# HTTP status codes worth retrying: rate limiting and server-side failures
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class LlmBusyError(Exception):
+    """Raised when no request slot frees up within the queue timeout."""
+
+
+class LlmClient:
+    """
+    A process-wide chat completion client shared by every session.
+    One Groq SDK client sits on a keep-alive httpx connection pool, so connections and
+    TLS sessions are reused across messages. At most `max_concurrency` requests run at
+    once; the rest wait up to `queue_timeout` seconds for a slot. Rate-limit (429), 5xx,
+    connection and timeout errors are retried with jittered exponential backoff; a
+    Retry-After header is honoured up to `backoff_max`. One call gives up once its
+    retries would run past `deadline` seconds, since it holds a slot while it waits.
+    `base_url` points the client at any server that speaks the Groq/OpenAI chat API,
+    e.g. benchmarks/fake_llm_server.py for load tests.
+    """
+
+    def __init__(self, api_key, base_url=None, max_connections=20, max_concurrency=8, timeout=30.0,
+                 max_retries=3, backoff_base=0.5, backoff_max=8.0, queue_timeout=30.0, deadline=60.0):
+        self._http = httpx.Client(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+        )
+        # Retries are done here, with jitter, instead of by the SDK
+        self._client = Groq(api_key=api_key, base_url=base_url, http_client=self._http, max_retries=0)
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.queue_timeout = queue_timeout
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "retries": 0, "failures": 0, "active": 0, "queue_wait_max": 0.0}
+
+    # --- Internals ---
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _acquire_slot(self):
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise LlmBusyError(f"The assistant is busy; no request slot freed up within {self.queue_timeout}s.")
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._counters["active"] += 1
+            self._counters["queue_wait_max"] = max(self._counters["queue_wait_max"], waited)
+
+    def _release_slot(self):
+        self._count("active", -1)
+        self._slots.release()
+
+    @staticmethod
+    def _is_retryable(error):
+        if isinstance(error, (groq.APIConnectionError, groq.APITimeoutError)):
+            return True
+        return isinstance(error, groq.APIStatusError) and error.status_code in RETRY_STATUSES
+
+    def _backoff(self, attempt, error, remaining):
+        """Seconds to wait before the next attempt, or None if that would run past the deadline."""
+        retry_after = None
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get("retry-after"))
+            except (TypeError, ValueError):
+                pass
+        if retry_after is not None and retry_after > remaining:
+            return None  # The server will not take the request again in time
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        # "Full jitter" keeps many sessions from retrying in lockstep
+        delay = min(self.backoff_max, max(retry_after or 0.0, random.uniform(0, delay)))
+        return delay if delay <= remaining else None
+
+    def _create(self, **kwargs):
+        """chat.completions.create with retries; must be called while holding a slot."""
+        deadline = time.monotonic() + self.deadline
+        for attempt in range(self.max_retries + 1):
+            self._count("requests")
+            try:
+                return self._client.chat.completions.create(**kwargs)
+            except Exception as e:
+                delay = None
+                if attempt < self.max_retries and self._is_retryable(e):
+                    delay = self._backoff(attempt, e, deadline - time.monotonic())
+                if delay is None:
+                    self._count("failures")
+                    raise
+                self._count("retries")
+                print(f"    - ⚠️ LLM request failed ({e.__class__.__name__}), retrying in {delay:.1f}s...")
+                time.sleep(delay)
+
+    # --- Public API ---
+    def chat(self, messages, model, **kwargs):
+        """Returns the full text of a chat completion."""
+        self._acquire_slot()
+        try:
+            completion = self._create(messages=messages, model=model, **kwargs)
+            return completion.choices[0].message.content
+        finally:
+            self._release_slot()
+
+    def stream_chat(self, messages, model, **kwargs):
+        """
+        Yields the chunks of a streamed chat completion. The request slot is held until
+        the stream is exhausted or the generator is closed, which also closes the stream.
+        """
+        self._acquire_slot()
+        stream = None
+        try:
+            stream = self._create(messages=messages, model=model, stream=True, **kwargs)
+            yield from stream
+        finally:
+            if stream is not None:
+                stream.close()
+            self._release_slot()
+
+    def stats(self):
+        """Request, retry and failure counters, requests in flight and the longest queue wait."""
+        with self._lock:
+            return dict(self._counters)
+
+    def close(self):
+        self._http.close()
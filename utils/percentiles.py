@@ -0,0 +1,9 @@
+def percentile(values, fraction):
+    """
+    The sorted value at index round(fraction * (len(values) - 1)), e.g. fraction=0.95 for the p95.
+    Returns 0.0 when there are no values yet.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
@@ -0,0 +1,129 @@
+import time
+import threading
+from collections import OrderedDict
+from utils.embedding_cache import normalize_text
+from utils.table_format import TAG_PATTERN
+
+
+def plain_text(document):
+    """Strips HTML tags so table chunks read as cell text to the cross-encoder."""
+    return " ".join(TAG_PATTERN.sub(" ", document).split())
+
+
+class Reranker:
+    """
+    Reorders retrieved chunks with a CPU cross-encoder, shared by every session.
+    Candidates are scored in batches of `batch_size`, and scores are cached per
+    (normalized query, chunk id) so a repeated question is reranked without the model.
+    The cost of one pair is measured as batches run, and a batch is only started (and
+    shrunk if need be) when its projected time still fits in `budget_ms`; otherwise the
+    rest is skipped and the retrieval order is kept for that query. Before the first
+    measurement nothing can be projected, so the very first batch may overshoot.
+    """
+
+    def __init__(self, model, batch_size=16, budget_ms=250, max_entries=20000):
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.budget_ms = budget_ms
+        self.max_entries = max(1, max_entries)
+        self._scores = OrderedDict()  # (normalized query, chunk id) -> score
+        self._pair_ms = None  # Moving average of the milliseconds spent per scored pair
+        self._lock = threading.Lock()
+        self._counters = {"queries": 0, "cached_scores": 0, "scored": 0, "fallbacks": 0}
+
+    def _cached(self, key):
+        with self._lock:
+            score = self._scores.get(key)
+            if score is not None:
+                self._scores.move_to_end(key)
+            return score
+
+    def _measure(self, pair_ms):
+        with self._lock:
+            self._pair_ms = pair_ms if self._pair_ms is None else 0.8 * self._pair_ms + 0.2 * pair_ms
+
+    def _remember(self, keys, scores):
+        with self._lock:
+            for key, score in zip(keys, scores):
+                self._scores[key] = float(score)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+
+    def rerank(self, query, results, top_k=5, sub_queries=None):
+        """
+        Takes a collection.query-shaped result ({'ids', 'documents', 'metadatas'}) and returns
+        the same shape with the `top_k` best chunks by cross-encoder score, or the first
+        `top_k` in their original order when the budget ran out. With `sub_queries` (the
+        parts of a compound question), every chunk is scored against each of them and the
+        picks alternate between sub-queries, so every part gets its share of the `top_k`.
+        """
+        start = time.perf_counter()
+        queries = list(dict.fromkeys(normalize_text(q) for q in (sub_queries or [query])))
+        ids = results['ids'][0]
+        documents = results['documents'][0]
+        metadatas = results['metadatas'][0]
+
+        scores = {(q, i): self._cached((q, doc_id)) for q in queries for i, doc_id in enumerate(ids)}
+        missing = [pair for pair, score in scores.items() if score is None]
+        cached = len(scores) - len(missing)
+        within_budget = True
+        batch_start = 0
+        while batch_start < len(missing):
+            size = self.batch_size
+            if self._pair_ms is not None:
+                # Only as many pairs as the measured cost says still fit in the budget
+                remaining_ms = self.budget_ms - (time.perf_counter() - start) * 1000
+                size = min(size, int(remaining_ms / self._pair_ms))
+            if size < 1:
+                within_budget = False
+                break
+            batch = missing[batch_start:batch_start + size]
+            batch_start += len(batch)
+            batch_time = time.perf_counter()
+            batch_scores = self.model.predict([(q, plain_text(documents[i])) for q, i in batch])
+            self._measure((time.perf_counter() - batch_time) * 1000 / len(batch))
+            self._remember([(q, ids[i]) for q, i in batch], batch_scores)
+            for pair, score in zip(batch, batch_scores):
+                scores[pair] = float(score)
+
+        with self._lock:
+            self._counters["queries"] += 1
+            self._counters["cached_scores"] += cached
+            self._counters["scored"] += sum(score is not None for score in scores.values()) - cached
+            self._counters["fallbacks"] += not within_budget
+
+        if within_budget:
+            order = self._interleave(queries, scores, len(ids), top_k)
+        else:
+            order = list(range(min(top_k, len(ids))))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"    - Reranked {len(ids)} candidates for {len(queries)} quer{'y' if len(queries) == 1 else 'ies'} "
+              f"in {elapsed_ms:.0f}ms ({cached} cached scores)"
+              + ("" if within_budget else f"; budget of {self.budget_ms}ms exceeded, kept retrieval order"))
+        return {
+            'ids': [[ids[i] for i in order]],
+            'documents': [[documents[i] for i in order]],
+            'metadatas': [[metadatas[i] for i in order]],
+        }
+
+    @staticmethod
+    def _interleave(queries, scores, count, top_k):
+        """Takes each query's best remaining chunk in turn until `top_k` are picked."""
+        rankings = [sorted(range(count), key=lambda i: scores[(q, i)], reverse=True) for q in queries]
+        order = []
+        for rank in range(count):
+            for ranking in rankings:
+                if len(order) >= top_k:
+                    return order
+                if ranking[rank] not in order:
+                    order.append(ranking[rank])
+        return order
+
+    def clear(self):
+        with self._lock:
+            self._scores.clear()
+
+    def stats(self):
+        """Queries reranked, scores served from cache or computed, and budget fallbacks."""
+        with self._lock:
+            return {**self._counters, "entries": len(self._scores)}
@@ -0,0 +1,135 @@
+import re
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Stand in for the student's full and first name in stored answers
+NAME_PLACEHOLDER = "{{student_name}}"
+FIRST_NAME_PLACEHOLDER = "{{first_name}}"
+# The scraper's stand-in profile name when the dashboard failed, and the shortest name
+# that is swapped for a placeholder (shorter ones would also match ordinary words)
+UNKNOWN_STUDENT_NAME = "Unknown_Student_ERROR"
+MIN_NAME_LENGTH = 3
+
+# Questions about the student themselves: their answer depends on personal data
+PERSONAL_PATTERN = re.compile(
+    r"\b(i|i'm|im|me|my|mine|myself|timetable|schedule)\b", re.IGNORECASE
+)
+# Follow-ups only make sense together with the conversation history
+FOLLOW_UP_PATTERN = re.compile(
+    r"\b(it|its|that|this|those|these|they|them|above|previous|again|more)\b", re.IGNORECASE
+)
+
+
+def is_general_question(question):
+    """True for stand-alone questions that can be answered from the handbook alone."""
+    return not PERSONAL_PATTERN.search(question) and not FOLLOW_UP_PATTERN.search(question)
+
+
+class ResponseCache:
+    """
+    Semantic cache of answers to general (handbook-only) questions, shared by every session.
+    A stored answer is served when a new question's embedding has a cosine similarity of at
+    least `threshold` with the stored question and retrieval returned the same handbook
+    chunks (in any order). Answers generated without any handbook chunks, e.g. after a
+    failed retrieval, are never cached. Entries expire after `ttl` seconds; beyond `max_entries` the least recently
+    used entry is evicted. The student's name is stored as placeholders and filled in
+    for whoever the answer is served to.
+    """
+
+    def __init__(self, threshold=0.92, ttl=6 * 60 * 60, max_entries=500):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()  # entry id -> entry dict
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evicted": 0}
+
+    @staticmethod
+    def _unit(embedding):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _usable_name(student_name):
+        """False when answers for this name cannot be safely shared, so caching is skipped."""
+        parts = (student_name or "").split()
+        return bool(parts) and student_name != UNKNOWN_STUDENT_NAME and len(parts[0]) >= MIN_NAME_LENGTH
+
+    @staticmethod
+    def _name_placeholders(student_name):
+        # The full name first, so "Ali Raza" is not left as "{{first_name}} Raza"
+        parts = student_name.split()
+        return [(student_name, NAME_PLACEHOLDER)] + ([(parts[0], FIRST_NAME_PLACEHOLDER)] if len(parts) > 1 else [])
+
+    def _drop_expired(self, now):
+        for entry_id in [i for i, e in self._entries.items() if now - e["stored_at"] > self.ttl]:
+            del self._entries[entry_id]
+            self._counters["expired"] += 1
+
+    def lookup(self, question_embedding, chunk_ids, student_name):
+        """The cached answer personalised for `student_name`, or None on a miss."""
+        if not chunk_ids or not self._usable_name(student_name):
+            return None
+        query = self._unit(question_embedding)
+        chunk_ids = frozenset(chunk_ids)
+        with self._lock:
+            self._drop_expired(time.time())
+            best_id, best_score = None, self.threshold
+            for entry_id, entry in self._entries.items():
+                if entry["chunk_ids"] != chunk_ids:
+                    continue
+                score = float(np.dot(query, entry["embedding"]))
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+            if best_id is None:
+                self._counters["misses"] += 1
+                return None
+            entry = self._entries[best_id]
+            self._entries.move_to_end(best_id)
+            entry["hits"] += 1
+            self._counters["hits"] += 1
+        print(f"    - Response cache hit (similarity {best_score:.3f}, entry served {entry['hits']} times): "
+              f"'{entry['question']}'")
+        answer = entry["answer"]
+        for name, placeholder in self._name_placeholders(student_name):
+            answer = answer.replace(placeholder, name)
+        # A single-word name has no separate first name
+        return answer.replace(FIRST_NAME_PLACEHOLDER, student_name)
+
+    def store(self, question, question_embedding, chunk_ids, answer, student_name):
+        """Remembers an answer to a general question."""
+        if not chunk_ids or not self._usable_name(student_name):
+            return
+        for name, placeholder in self._name_placeholders(student_name):
+            # Whole words only, so "Ali" does not turn "Alignment" into "{{first_name}}gnment"
+            answer = re.sub(rf"(?<!\w){re.escape(name)}(?!\w)", placeholder, answer)
+        with self._lock:
+            self._entries[self._next_id] = {
+                "question": question,
+                "embedding": self._unit(question_embedding),
+                "chunk_ids": frozenset(chunk_ids),
+                "answer": answer,
+                "stored_at": time.time(),
+                "hits": 0,
+            }
+            self._next_id += 1
+            self._counters["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evicted"] += 1
+
+    def stats(self):
+        """Counters plus the hit rate and the entries that were served most often."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            top = sorted(self._entries.values(), key=lambda e: e["hits"], reverse=True)[:5]
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else 0.0,
+                "top_questions": [(e["question"], e["hits"]) for e in top if e["hits"]],
+            }
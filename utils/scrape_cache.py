@@ -0,0 +1,155 @@
+import os
+import re
+import json
+import time
+import hmac
+import hashlib
+import threading
+
+CACHE_FOLDER = "data"
+
+# How long (in seconds) each scraped section stays fresh
+SECTION_TTLS = {
+    "profile": 6 * 60 * 60,
+    "attendance": 15 * 60,
+    "semester_results": 12 * 60 * 60,
+    "financials": 60 * 60,
+    "timetable": 24 * 60 * 60,
+    "enrolled_courses": 12 * 60 * 60,
+}
+
+PASSWORD_HASH_ITERATIONS = 200_000
+
+
+def safe_roll_no(roll_no):
+    """Roll number cleaned up for use as a file name."""
+    return re.sub(r'[\\/*?:"<>|]', "", roll_no).replace(' ', '_')
+
+
+def _hash_password(password, salt):
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, PASSWORD_HASH_ITERATIONS).hex()
+
+
+class ScrapeCache:
+    """
+    On-disk cache of scraped ERP data, one file per roll number.
+    `data/<roll_no>.json` holds the same erp_data dict the scraper returns and
+    `data/<roll_no>.meta.json` records when each section was fetched, the section
+    fingerprints used by incremental scrapes, plus a salted password hash so cached
+    data is only served to someone who can log in.
+    """
+
+    def __init__(self, folder=CACHE_FOLDER, ttls=None):
+        self.folder = folder
+        self.ttls = {**SECTION_TTLS, **(ttls or {})}
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+    def _paths(self, roll_no):
+        base = os.path.join(self.folder, safe_roll_no(roll_no))
+        return f"{base}.json", f"{base}.meta.json"
+
+    def data_path(self, roll_no):
+        """Path of the JSON file holding a student's cached erp_data."""
+        return self._paths(roll_no)[0]
+
+    @staticmethod
+    def _read_json(path, default):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return default
+
+    @staticmethod
+    def _write_json(path, payload):
+        # Write to a temporary file first so readers never see a half-written file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=4)
+        os.replace(tmp_path, path)
+
+    def load(self, roll_no):
+        """Returns (data, meta) for a roll number; data is None when nothing is cached."""
+        data_path, meta_path = self._paths(roll_no)
+        data = self._read_json(data_path, None)
+        meta = self._read_json(meta_path, {"sections": {}})
+        return data, meta
+
+    @staticmethod
+    def _credential_matches(meta, password):
+        credential = meta.get("credential")
+        if not credential:
+            return False
+        expected = _hash_password(password, bytes.fromhex(credential["salt"]))
+        return hmac.compare_digest(expected, credential["hash"])
+
+    def load_verified(self, roll_no, password):
+        """Cached data for a roll number, or None if there is none or the password does not match."""
+        data, meta = self.load(roll_no)
+        if data is None or not self._credential_matches(meta, password):
+            return None
+        return data
+
+    def snapshot(self, roll_no):
+        """The previous scrape in the form EnhancedErpScraper.scrape_all_data(snapshot=...) expects."""
+        data, meta = self.load(roll_no)
+        return {"data": data or {}, "fingerprints": meta.get("fingerprints", {})}
+
+    def save(self, roll_no, data, password=None, fingerprints=None, failed_sections=()):
+        """
+        Merges the sections present in `data` into the cache and marks them as fresh.
+        `failed_sections` (the scraper's failed_sections) are not marked fresh, so the last
+        good data, its timestamp and its fingerprint are kept for them. When nothing was
+        cached for a failed section yet, the scraper's placeholder is stored instead.
+        """
+        now = time.time()
+        data_path, meta_path = self._paths(roll_no)
+        with self._lock:
+            cached, meta = self.load(roll_no)
+            cached = cached or {'roll_no': roll_no}
+            for section in self.ttls:
+                if section not in data:
+                    continue
+                if section not in failed_sections:
+                    cached[section] = data[section]
+                    meta.setdefault("sections", {})[section] = now
+                elif section not in cached:
+                    cached[section] = data[section]
+            fingerprints = {s: f for s, f in (fingerprints or {}).items() if s not in failed_sections}
+            if fingerprints:
+                meta.setdefault("fingerprints", {}).update(fingerprints)
+            if password is not None:
+                salt = os.urandom(16)
+                meta["credential"] = {"salt": salt.hex(), "hash": _hash_password(password, salt)}
+            self._write_json(data_path, cached)
+            self._write_json(meta_path, meta)
+        return cached
+
+    def forget_credential(self, roll_no, password):
+        """
+        Stops serving cached data for a roll number until the next successful login, after
+        the ERP rejected `password`. A password other than the stored one cannot unlock
+        the cache anyway, so someone else's wrong guess leaves the credential alone.
+        """
+        _, meta_path = self._paths(roll_no)
+        with self._lock:
+            _, meta = self.load(roll_no)
+            if self._credential_matches(meta, password):
+                del meta["credential"]
+                self._write_json(meta_path, meta)
+
+    def stale_sections(self, roll_no, now=None):
+        """Sections that were never cached or whose TTL has run out."""
+        now = time.time() if now is None else now
+        _, meta = self.load(roll_no)
+        fetched = meta.get("sections", {})
+        return [s for s, ttl in self.ttls.items() if now - fetched.get(s, 0) > ttl]
+
+    def last_updated(self, roll_no):
+        """Modification time of the cached data file, or 0 if there is none."""
+        data_path, _ = self._paths(roll_no)
+        try:
+            return os.path.getmtime(data_path)
+        except OSError:
+            return 0
@@ -0,0 +1,103 @@
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# Finished jobs are kept this many seconds so the UI can pick up their result
+FINISHED_JOB_RETENTION = 10 * 60
+
+
+class ScrapeJob:
+    """One background scrape and its per-section progress."""
+
+    def __init__(self, roll_no, owner_key, sections):
+        # The random id is what a session keeps to poll the job
+        self.id = uuid.uuid4().hex
+        self.roll_no = roll_no
+        self.owner_key = owner_key
+        self.status = "queued"
+        self.progress = {section: "pending" for section in sections}
+        self.partial_data = {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def done_count(self):
+        return sum(1 for state in self.progress.values() if state != "pending")
+
+    def section_finished(self, section, data):
+        """Callback for the scraper: marks a section as done (or failed if it produced nothing)."""
+        self.progress[section] = "done" if data is not None else "failed"
+        if data is not None:
+            self.partial_data[section] = data
+
+
+class ScrapeJobScheduler:
+    """
+    Runs scrapes on a bounded worker pool instead of the Streamlit script thread.
+    A second request for a roll number that already has a queued or running job
+    (with the same owner key) gets that job back instead of starting another scrape.
+    """
+
+    def __init__(self, max_workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape-job")
+        self._jobs = {}  # job id -> ScrapeJob
+        self._lock = threading.Lock()
+
+    def submit(self, roll_no, owner_key, sections, task):
+        """
+        Queues `task(job)` for a roll number and returns its ScrapeJob.
+        `task` should report progress through job.section_finished and return the
+        scraped data, or raise / return {"error": ...} on failure.
+        """
+        with self._lock:
+            self._forget_old_jobs()
+            for job in self._jobs.values():
+                if job.roll_no == roll_no and job.owner_key == owner_key and job.status in ACTIVE_STATUSES:
+                    print(f"--- Reusing in-flight scrape job {job.id} for {roll_no} ---")
+                    return job
+            job = ScrapeJob(roll_no, owner_key, sections)
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, task)
+        return job
+
+    def _run(self, job, task):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            result = task(job)
+            if not result or "error" in result:
+                job.error = (result or {}).get("error", "an unknown error occurred")
+                job.status = "failed"
+            else:
+                job.result = result
+                job.status = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            print(f"--- Scrape job {job.id} for {job.roll_no} {job.status} "
+                  f"in {job.finished_at - job.started_at:.1f}s ---")
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _forget_old_jobs(self):
+        cutoff = time.time() - FINISHED_JOB_RETENTION
+        for job_id in [j.id for j in self._jobs.values() if j.finished_at and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def stats(self):
+        """Number of jobs in each status."""
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return counts
@@ -0,0 +1,90 @@
+import os
+import json
+import time
+import base64
+import hashlib
+import threading
+from cryptography.fernet import Fernet, InvalidToken
+from utils.scrape_cache import safe_roll_no
+
+SESSION_FOLDER = os.path.join("data", "sessions")
+
+# Saved sessions older than this are not tried again, even if their cookies have no expiry
+SESSION_MAX_AGE = 6 * 60 * 60
+
+KEY_DERIVATION_ITERATIONS = 200_000
+
+
+def _fernet(password, salt):
+    key = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, KEY_DERIVATION_ITERATIONS)
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+class SessionStore:
+    """
+    Encrypted on-disk store of authenticated ERP session cookies, one file per roll number.
+    The cookies are encrypted with a key derived from the student's password, so a
+    saved session can only be reused by someone who knows it.
+    """
+
+    def __init__(self, folder=SESSION_FOLDER, max_age=SESSION_MAX_AGE):
+        self.folder = folder
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, roll_no):
+        return os.path.join(self.folder, f"{safe_roll_no(roll_no)}.session")
+
+    def save(self, roll_no, password, cookies):
+        """Encrypts and stores the cookies of a freshly logged-in browser."""
+        salt = os.urandom(16)
+        payload = json.dumps({"saved_at": time.time(), "cookies": cookies}).encode("utf-8")
+        record = {"salt": salt.hex(), "token": _fernet(password, salt).encrypt(payload).decode("ascii")}
+        path = self._path(roll_no)
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            # Readable by the owner only
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(record, f)
+            os.replace(tmp_path, path)
+
+    def _decrypt(self, roll_no, password):
+        """The decrypted session payload, or None if there is none or it was saved with another password."""
+        try:
+            with open(self._path(roll_no), 'r', encoding='utf-8') as f:
+                record = json.load(f)
+            return _fernet(password, bytes.fromhex(record["salt"])).decrypt(record["token"].encode("ascii"))
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError, InvalidToken):
+            return None
+
+    def load(self, roll_no, password, now=None):
+        """
+        The saved cookies for a roll number, or None if there are none, they were saved
+        with another password, they are older than max_age or every cookie has expired.
+        """
+        now = time.time() if now is None else now
+        payload = self._decrypt(roll_no, password)
+        if payload is None:
+            return None
+
+        session = json.loads(payload)
+        if now - session["saved_at"] > self.max_age:
+            self.forget(roll_no)
+            return None
+        cookies = [c for c in session["cookies"] if not c.get("expiry") or c["expiry"] > now]
+        return cookies or None
+
+    def forget(self, roll_no, password=None):
+        """
+        Deletes the saved session, e.g. after the ERP rejected it. With a `password` the
+        session is only deleted if it was saved with that password.
+        """
+        if password is not None and self._decrypt(roll_no, password) is None:
+            return
+        with self._lock:
+            try:
+                os.remove(self._path(roll_no))
+            except FileNotFoundError:
+                pass
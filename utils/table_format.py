@@ -0,0 +1,134 @@
+import re
+from html.parser import HTMLParser
+
+TABLE_PATTERN = re.compile(r"<table\b.*?</table>", re.IGNORECASE | re.DOTALL)
+# Real opening or closing tags only, so prose such as "CGPA < 2.0 ... GPA > 3.5" survives
+TAG_PATTERN = re.compile(r"</?[a-zA-Z][^>]*>")
+
+
+class _TableParser(HTMLParser):
+    """Collects the rows of an HTML table as lists of cell texts; colspan cells are repeated."""
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self.header_rows = 0
+        self._row = None
+        self._cell = None
+        self._span = 1
+        self._row_has_header = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._row, self._row_has_header = [], False
+        elif tag in ("td", "th") and self._row is not None:
+            self._cell = []
+            self._row_has_header |= tag == "th"
+            try:
+                self._span = max(1, int(dict(attrs).get("colspan") or 1))
+            except ValueError:
+                self._span = 1
+        elif tag == "br" and self._cell is not None:
+            self._cell.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in ("td", "th") and self._cell is not None:
+            text = " ".join("".join(self._cell).split())
+            self._row.extend([text] * self._span)
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            if any(self._row):
+                if self._row_has_header and len(self.rows) == self.header_rows:
+                    self.header_rows += 1
+                self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def parse_table(table_html):
+    """
+    (columns, rows) of one HTML table, every row padded to the same width. `columns` are
+    the <th> header cells (several header rows are joined per column), or None.
+    """
+    parser = _TableParser()
+    parser.feed(table_html)
+    parser.close()
+    if not parser.rows:
+        return None, []
+    width = max(len(row) for row in parser.rows)
+    rows = [row + [""] * (width - len(row)) for row in parser.rows]
+    if not parser.header_rows:
+        return None, rows
+    header = rows[:parser.header_rows]
+    columns = [" ".join(dict.fromkeys(cell for cell in column if cell)) for column in zip(*header)]
+    return columns, rows[parser.header_rows:]
+
+
+def table_records(columns, rows):
+    """One dict per row, keyed by column name ("column_N" where a header cell is empty or missing)."""
+    names = [(columns[i] if columns and columns[i] else f"column_{i + 1}") for i in range(len(rows[0]))] if rows else []
+    return [dict(zip(names, row)) for row in rows]
+
+
+def table_to_text(columns, rows, max_chars=1000):
+    """
+    A short plain-text rendition for embedding: "Table: col, col. a, b; c, d; ..." cut at
+    `max_chars` on a row boundary (the embedding model only reads the start anyway).
+    """
+    text = f"Table: {', '.join(c for c in columns if c)}." if columns else "Table:"
+    for row in rows:
+        row_text = ", ".join(cell for cell in row if cell)
+        if not row_text:
+            continue
+        if len(text) + len(row_text) + 2 > max_chars:
+            break
+        text += f" {row_text};"
+    return text
+
+
+def html_table_to_markdown(table_html):
+    """
+    Rewrites one HTML table as dense markdown: "a|b|c" rows, with the header row (or the
+    first row) followed by a "-|-|-" separator. Returns plain text if no rows were found.
+    """
+    columns, rows = parse_table(table_html)
+    if not rows and not columns:
+        return " ".join(TAG_PATTERN.sub(" ", table_html).split())
+    return _markdown(columns, rows)
+
+
+def _markdown(columns, rows):
+    lines = [[cell.replace("|", "/") for cell in row] for row in ([columns] if columns else []) + rows]
+    width = len(lines[0])
+    lines.insert(1, ["-"] * width)
+    return "\n".join("|".join(cells) for cells in lines)
+
+
+def compact_table_chunk(chunk):
+    """
+    The ingestion form of a table chunk. `content` becomes the dense markdown used in prompts,
+    `embedding_text` the short rendition that is embedded, and `table` keeps the original HTML
+    with the header-aware row records. Chunks that are not HTML tables, or are already
+    compacted, are returned unchanged.
+    """
+    html = chunk['content']
+    if 'table' in chunk or not TABLE_PATTERN.search(html):
+        return chunk
+    columns, rows = parse_table(html)
+    if not rows:
+        return chunk
+    return {
+        **chunk,
+        "content": _markdown(columns, rows),
+        "embedding_text": table_to_text(columns, rows),
+        "table": {"html": html, "columns": columns, "records": table_records(columns, rows)},
+    }
+
+
+def compact_tables(text):
+    """Replaces every HTML table in `text` with its markdown form and drops any other tags."""
+    text = TABLE_PATTERN.sub(lambda match: html_table_to_markdown(match.group(0)), text)
+    return TAG_PATTERN.sub(" ", text) if "<" in text else text
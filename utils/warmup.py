@@ -0,0 +1,74 @@
+import os
+import json
+import time
+import threading
+
+
+class Warmup:
+    """
+    Runs named start-up steps once, in order, on a background thread and records how
+    long each one took. Every step is called with the results of the earlier steps.
+    `ready` is the instance's health flag: True once every step has succeeded. When a
+    `ready_file` is given it is written at that moment (and removed on start), so
+    a readiness probe can check for it.
+    """
+
+    def __init__(self, steps, ready_file=None):
+        self.steps = steps
+        self.ready_file = ready_file
+        self.results = {}
+        self.timings = {}
+        self.error = None
+        self.failed_step = None
+        self.ready = False
+        self._done = threading.Event()
+
+    def start(self):
+        if self.ready_file and os.path.exists(self.ready_file):
+            os.remove(self.ready_file)
+        threading.Thread(target=self._run, name="warmup", daemon=True).start()
+        return self
+
+    def _run(self):
+        print("--- Warming up ---")
+        total_start = time.perf_counter()
+        try:
+            for name, step in self.steps:
+                start = time.perf_counter()
+                try:
+                    self.results[name] = step(self.results)
+                except Exception as e:
+                    self.error = f"{name}: {e}"
+                    self.failed_step = name
+                    print(f"    - ❌ Warm-up step '{name}' failed: {e}")
+                    return
+                finally:
+                    self.timings[name] = time.perf_counter() - start
+                print(f"    - {name:<18} {self.timings[name]:6.2f}s")
+
+            self.timings["total"] = time.perf_counter() - total_start
+            self.ready = True
+            print(f"--- ✅ Warm-up finished in {self.timings['total']:.2f}s, ready to serve ---")
+            if self.ready_file:
+                with open(self.ready_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.status(), f, indent=4)
+        finally:
+            self._done.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Blocks until the warm-up has finished (or failed). Returns the ready flag."""
+        self._done.wait(timeout)
+        return self.ready
+
+    def status(self):
+        """Health summary: ready flag, error and failed step (if any) and seconds spent in each step."""
+        return {
+            "ready": self.ready,
+            "error": self.error,
+            "failed_step": self.failed_step,
+            "timings": {name: round(seconds, 3) for name, seconds in self.timings.items()},
+        }
@@ -0,0 +1,32 @@
+from collections import Counter
+
+
+class CommandCounter:
+    """
+    Counts the WebDriver protocol commands a driver sends while the `with` block runs.
+    Every command (find_element, get_attribute, execute_script, ...) is one HTTP
+    round-trip to geckodriver, so `total` is the number of round-trips.
+    Elements found through the driver send their commands through it too and are counted.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.counts = Counter()
+
+    def __enter__(self):
+        original_execute = self.driver.execute
+
+        def execute(driver_command, params=None):
+            self.counts[driver_command] += 1
+            return original_execute(driver_command, params)
+
+        # Shadow the bound method on this instance only
+        self.driver.execute = execute
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        del self.driver.execute
+
+    @property
+    def total(self):
+        return sum(self.counts.values())